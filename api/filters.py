@@ -1,14 +1,18 @@
 from django_filters import rest_framework as filters
 
 from books.models import Book
+from books.search import search_books
+from books.author_search import AuthorFiltersMixin
+from books.languages import language_resolver
 
 
-class BookFilter(filters.FilterSet):
-    """ Book object filter class. """
-    authors__first_name = filters.CharFilter(lookup_expr='iexact')
-    authors__second_name = filters.CharFilter(lookup_expr='icontains')
-    authors__last_name = filters.CharFilter(lookup_expr='iexact')
-    language__shortcut = filters.CharFilter(lookup_expr='iexact')
+class BookFilter(AuthorFiltersMixin, filters.FilterSet):
+    """ Book object filter class, author filters match the same author. """
+    q = filters.CharFilter(method='filter_search')
+    authors__first_name = filters.CharFilter()
+    authors__second_name = filters.CharFilter()
+    authors__last_name = filters.CharFilter()
+    language__shortcut = filters.CharFilter(method='filter_language_shortcut')
     publication_year = filters.RangeFilter()
 
     class Meta:
@@ -16,3 +20,12 @@ class BookFilter(filters.FilterSet):
         fields = {
             'title': ['iexact', 'contains'],
         }
+
+    def filter_search(self, queryset, name, value):
+        """ Full-text search in titles and author names. """
+        return search_books(queryset, value)
+
+    def filter_language_shortcut(self, queryset, name, value):
+        """ Filters by language shortcut (case-insensitive)
+        resolved without joining languages. """
+        return queryset.filter(language_id__in=language_resolver.get_ids(value))
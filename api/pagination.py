@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from rest_framework.pagination import CursorPagination
+
+from books.cache import get_listing_cache_key
+from books.pagination import get_cached_count
+
+
+class BookCursorPagination(CursorPagination):
+    """ Cursor pagination class for Book objects. Pages are ordered
+    by title and id, so the next page starts with an index seek,
+    search results are ordered by relevance. """
+    ordering = ('title', 'id')
+    search_ordering = ('search_rank', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    count_query_param = 'count'
+    count_values = ('1', 'true')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """ Paginates books, counted (with get_cached_count)
+        when the count parameter is passed. """
+        self.counted = None
+        if request.query_params.get(self.count_query_param) in self.count_values:
+            self.counted = get_cached_count(queryset, get_listing_cache_key(
+                'count:api', request.query_params, view.filterset_class))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """ Returns page response with the count if requested,
+        count_exact is false when it's only a lower bound. """
+        response = super().get_paginated_response(data)
+        if self.counted is not None:
+            count, exact = self.counted
+            response.data = OrderedDict(
+                [('count', count), ('count_exact', exact)] +
+                list(response.data.items()))
+        return response
+
+    def get_ordering(self, request, queryset, view):
+        """ Orders full-text search results by relevance. """
+        if 'search_rank' in queryset.query.annotations:
+            return self.search_ordering
+        return super().get_ordering(request, queryset, view)
@@ -1,6 +1,19 @@
+from typing import Dict, Any, List, Iterable, Optional, Sequence
 from rest_framework import serializers
 
-from books.models import Author, Book
+from books.models import Author, Book, BookAuthor
+
+
+BOOK_COLUMNS = {
+    'title': 'title',
+    'authors': None,
+    'publication_year': 'publication_year',
+    'language': 'language__shortcut',
+    'isbn': 'isbn',
+    'page_count': 'page_count',
+    'cover_link': 'cover_link',
+}
+BOOK_FIELDS = list(BOOK_COLUMNS)
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -11,18 +24,78 @@ class AuthorSerializer(serializers.ModelSerializer):
 
 
 class BookSerializer(serializers.ModelSerializer):
-    """ Serializer for Book objects. """
+    """ Serializer for Book objects, limited to passed fields if given. """
     authors = AuthorSerializer(many=True, read_only=True)
     language = serializers.SlugRelatedField(
         slug_field='shortcut', read_only=True)
 
     class Meta:
         model = Book
-        fields = [
-            'title',
-            'authors',
-            'publication_year',
-            'language',
-            'isbn',
-            'page_count',
-            'cover_link']
+        fields = BOOK_FIELDS
+
+    def __init__(self, *args, fields: Optional[Sequence[str]] = None,
+                 **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def get_requested_fields(value: Optional[str]) -> List[str]:
+    """ Function which parses comma separated book field names
+    and returns them in serializer order, all fields when not passed.
+    A value without any field name is rejected. """
+    if not value:
+        return BOOK_FIELDS
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    if not requested:
+        raise serializers.ValidationError(
+            {'fields': [f"No fields requested. "
+                        f"Available: {', '.join(BOOK_FIELDS)}."]})
+    unknown = requested - set(BOOK_FIELDS)
+    if unknown:
+        raise serializers.ValidationError(
+            {'fields': [f"Unknown fields: {', '.join(sorted(unknown))}. "
+                        f"Available: {', '.join(BOOK_FIELDS)}."]})
+    return [name for name in BOOK_FIELDS if name in requested]
+
+
+def get_book_values(fields: Sequence[str]) -> List[str]:
+    """ Function which returns values() columns needed to serialise
+    passed book fields, with id and title used for paging. """
+    return ['id', 'title'] + [
+        BOOK_COLUMNS[name] for name in fields
+        if BOOK_COLUMNS[name] and name != 'title']
+
+
+def get_book_authors(book_ids: Iterable[int]) -> Dict[int, List[Dict[str, str]]]:
+    """ Function which returns serialised authors of passed books
+    grouped by book id, in the order they were added to the book. """
+    authors = {}
+    for book_id, first_name, second_name, last_name in BookAuthor.objects.filter(
+            book_id__in=book_ids).order_by('id').values_list(
+            'book_id', 'author__first_name', 'author__second_name',
+            'author__last_name'):
+        authors.setdefault(book_id, []).append({
+            'first_name': first_name,
+            'second_name': second_name,
+            'last_name': last_name,
+        })
+    return authors
+
+
+def serialize_book_rows(rows: List[Dict[str, Any]],
+                        fields: Sequence[str] = BOOK_FIELDS
+                        ) -> List[Dict[str, Any]]:
+    """ Function which serialises book rows (dictionaries of get_book_values()
+    columns of passed fields) with one query for their authors, if requested.
+    Output is the same as BookSerializer's, without the per row
+    and per field serializer overhead. """
+    columns = [(name, BOOK_COLUMNS[name]) for name in fields]
+    authors = {}
+    if 'authors' in fields:
+        authors = get_book_authors(row['id'] for row in rows)
+    return [{
+        name: row[column] if column else authors.get(row['id'], [])
+        for name, column in columns
+    } for row in rows]
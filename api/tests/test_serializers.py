@@ -0,0 +1,62 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import BOOK_FIELDS, BookSerializer, get_book_values, serialize_book_rows
+from api.views import BookViewSet
+from books.models import Book
+from books.languages import language_resolver
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class SerializeBookRowsTests(TestCase):
+
+    def setUp(self):
+        language_resolver.invalidate()
+        polish = create_sample_language()
+        english = create_sample_language(language='English', shortcut='en')
+        andersen = create_sample_author()
+        sienkiewicz = create_sample_author(
+            first_name='Henryk', second_name='', last_name='Sienkiewicz')
+        mickiewicz = create_sample_author(
+            first_name='Adam', second_name='Bernard', last_name='Mickiewicz')
+        create_sample_book(
+            title='Brzydkie kaczątko', language=polish,
+            authors=[sienkiewicz, andersen, mickiewicz])
+        create_sample_book(
+            title='Hobbit "Tam i z powrotem"', isbn=None, page_count=None,
+            cover_link=None, language=english, authors=[mickiewicz])
+        create_sample_book(title='Anonim', language=polish, authors=[])
+
+    def test_serialize_book_rows_parity(self):
+        """ Test rendered rows are byte-identical to BookSerializer's. """
+        books = BookViewSet.queryset.order_by('title', 'id')
+        expected = JSONRenderer().render(BookSerializer(books, many=True).data)
+        with self.assertNumQueries(2):
+            rows = list(Book.objects.order_by('title', 'id').values(
+                *get_book_values(BOOK_FIELDS)))
+            data = serialize_book_rows(rows)
+        self.assertEqual(JSONRenderer().render(data), expected)
+        self.assertEqual(len(data[1]['authors']), 3)
+
+    def test_list_parity(self):
+        """ Test book list responses are byte-identical with
+        and without the fast serialisation path. """
+        url = reverse('book-list')
+        for params in ['', '?page_size=1', '?q=kaczatko',
+                       '?authors__last_name=mickiewicz',
+                       '?language__shortcut=en', '?fields=isbn,title',
+                       '?fields=authors&page_size=1&q=hobbit',
+                       '?format=api']:
+            cache.clear()
+            fast = self.client.get(url + params)
+            cache.clear()
+            with patch.object(BookViewSet, 'fast_list', False):
+                slow = self.client.get(url + params)
+            self.assertEqual(fast.status_code, 200)
+            if params == '?format=api':
+                self.assertContains(fast, 'Brzydkie kaczątko')
+            else:
+                self.assertEqual(fast.content, slow.content, params)
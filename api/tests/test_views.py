@@ -0,0 +1,125 @@
+import json
+from django.urls import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from books.languages import language_resolver
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class BookViewSetTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.authors = [
+            create_sample_author(),
+            create_sample_author(
+                first_name='Henryk', second_name='', last_name='Sienkiewicz'),
+        ]
+
+    def create_books(self, count: int, start: int = 0) -> None:
+        """ Creating passed number of sample books with two authors. """
+        for i in range(start, start + count):
+            create_sample_book(
+                title=f'Book {i}',
+                language=self.language,
+                authors=self.authors)
+
+    def test_list_books(self):
+        """ Test books list with nested authors and language. """
+        self.create_books(1)
+        response = self.client.get(reverse('book-list'))
+        book = response.json()['results'][0]
+        self.assertEqual(book['title'], 'Book 0')
+        self.assertEqual(book['language'], 'pl')
+        self.assertEqual(
+            book['authors'][1],
+            {'first_name': 'Henryk', 'second_name': '', 'last_name': 'Sienkiewicz'})
+
+    def test_list_books_query_count(self):
+        """ Test books list runs a constant number of queries. """
+        self.create_books(1)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('book-list'))
+        self.create_books(20, start=1)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('book-list'))
+        self.assertEqual(len(response.json()['results']), 21)
+
+    def test_list_books_filtered_query_count(self):
+        """ Test filtered books list runs a constant number of queries. """
+        self.create_books(10)
+        url = reverse('book-list')
+        language_resolver.get_ids('pl')
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                url, {'authors__last_name': 'Andersen',
+                      'language__shortcut': 'pl'})
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_list_books_cursor_pagination(self):
+        """ Test paging through books with cursor pagination. """
+        self.create_books(5)
+        url = reverse('book-list') + '?page_size=2'
+        titles = []
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            data = response.json()
+            titles += [book['title'] for book in data['results']]
+            url = data['next']
+        self.assertEqual(titles, [f'Book {i}' for i in range(5)])
+
+    def test_list_books_fields(self):
+        """ Test sparse fieldsets trim the response and the query. """
+        self.create_books(3)
+        url = reverse('book-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'isbn, title'})
+        book = response.json()['results'][0]
+        self.assertEqual(list(book), ['title', 'isbn'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('books_language', queries[0]['sql'])
+        self.assertNotIn('page_count', queries[0]['sql'])
+        response = self.client.get(url, {'fields': 'language,authors'})
+        book = response.json()['results'][0]
+        self.assertEqual(list(book), ['authors', 'language'])
+        self.assertEqual(len(book['authors']), 2)
+
+    def test_list_books_unknown_fields(self):
+        """ Test requesting unknown fields. """
+        response = self.client.get(reverse('book-list'), {'fields': 'title,price'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('price', response.json()['fields'][0])
+
+    def test_list_books_empty_fields(self):
+        """ Test requesting fields without any name. """
+        for value in [',', ' , ']:
+            response = self.client.get(reverse('book-list'), {'fields': value})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('No fields requested', response.json()['fields'][0])
+
+
+class ExportBooksViewTests(TestCase):
+
+    def setUp(self):
+        language = create_sample_language()
+        author = create_sample_author()
+        create_sample_book(language=language, authors=[author])
+
+    def test_export_books_ndjson(self):
+        """ Test streaming catalogue export as NDJSON. """
+        response = self.client.get(
+            reverse('book-export', kwargs={'file_format': 'ndjson'}))
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(json.loads(content)['title'], 'Brzydkie kaczątko')
+
+    def test_export_books_csv(self):
+        """ Test streaming catalogue export as CSV. """
+        response = self.client.get(
+            reverse('book-export', kwargs={'file_format': 'csv'}))
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(content.splitlines()), 2)
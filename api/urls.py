@@ -1,7 +1,7 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 
-from api.views import BookViewSet
+from api.views import BookViewSet, export_books
 
 
 router = DefaultRouter()
@@ -9,5 +9,9 @@ router.register(r'books', BookViewSet)
 
 
 urlpatterns = [
+    re_path(
+        r'^export/(?P<file_format>ndjson|csv)/$',
+        export_books,
+        name='book-export'),
     path('', include(router.urls)),
 ]
@@ -1,12 +1,100 @@
+from typing import List
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 from rest_framework import viewsets, mixins
+from rest_framework.response import Response
 
-from books.models import Book
-from api.serializers import BookSerializer
+from books.models import Author, Book
+from books.export import EXPORT_FORMATS, iter_books
+from books.cache import (
+    LISTING_CACHE_TIMEOUT,
+    get_listing_cache_key,
+    get_catalogue_etag
+)
+from api.serializers import (
+    BookSerializer,
+    get_requested_fields,
+    get_book_values,
+    serialize_book_rows
+)
 from api.filters import BookFilter
+from api.pagination import BookCursorPagination
 
 
+@method_decorator(vary_on_headers('Accept'), name='list')
+@method_decorator(condition(etag_func=get_catalogue_etag), name='list')
 class BookViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
     """ Viewset for list books. """
     serializer_class = BookSerializer
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('language').prefetch_related(
+        Prefetch('authors', queryset=Author.objects.order_by('bookauthor__id')))
     filterset_class = BookFilter
+    pagination_class = BookCursorPagination
+    fast_list = True
+
+    def get_fields(self) -> List[str]:
+        """ Returns book fields requested with the fields parameter. """
+        if not hasattr(self, '_fields'):
+            self._fields = get_requested_fields(
+                self.request.query_params.get('fields'))
+        return self._fields
+
+    def get_queryset(self):
+        """ Returns books queryset which loads only columns
+        and relations of the requested fields. """
+        queryset = super().get_queryset()
+        fields = self.get_fields()
+        if 'authors' not in fields:
+            queryset = queryset.prefetch_related(None)
+        if 'language' not in fields:
+            queryset = queryset.select_related(None)
+        return queryset.only(*get_book_values(fields))
+
+    def get_serializer(self, *args, **kwargs):
+        """ Returns serializer limited to the requested fields. """
+        kwargs.setdefault('fields', self.get_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """ Lists books, serialised pages are cached
+        until the catalogue changes. """
+        params = request.query_params.copy()
+        if 'fields' in params:
+            params['fields'] = ','.join(self.get_fields())
+        key = get_listing_cache_key(
+            f'api:{request.get_host()}', params, self.filterset_class,
+            extra=['cursor', 'page_size', 'fields', 'count'])
+        data = cache.get(key)
+        if data is None:
+            if self.fast_list:
+                response = self.list_values(request)
+            else:
+                response = super().list(request, *args, **kwargs)
+            cache.set(key, response.data, LISTING_CACHE_TIMEOUT)
+            return response
+        return Response(data)
+
+    def list_values(self, request):
+        """ Lists books paginated over values() rows and serialised
+        by serialize_book_rows, with the same output as BookSerializer. """
+        fields = self.get_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        values = get_book_values(fields)
+        if 'search_rank' in queryset.query.annotations:
+            values.append('search_rank')
+        page = self.paginate_queryset(
+            queryset.select_related(None).prefetch_related(None).values(*values))
+        return self.get_paginated_response(serialize_book_rows(page, fields))
+
+
+def export_books(request, file_format):
+    """ View which streams the whole book catalogue as NDJSON or CSV. """
+    writer, content_type = EXPORT_FORMATS[file_format]
+    response = StreamingHttpResponse(
+        writer(iter_books()), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="books.{file_format}"'
+    return response
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BooksConfig(AppConfig):
     name = 'books'
+
+    def ready(self):
+        from books.db import create_database_objects
+        from books.signals import connect_signals
+        post_migrate.connect(create_database_objects, sender=self)
+        connect_signals()
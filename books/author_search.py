@@ -0,0 +1,122 @@
+from typing import Dict, Optional, Iterable, Iterator
+from django.db import transaction
+from django.db.models import QuerySet
+
+from books.models import Author, BookAuthor
+
+
+BACKFILL_CHUNK_SIZE = 1000
+AUTHOR_FILTERS = {
+    'authors__first_name': 'author_first_name__exact',
+    'authors__second_name': 'author_second_name__contains',
+    'authors__last_name': 'author_last_name__exact',
+}
+
+
+def normalise_name(name: Optional[str]) -> str:
+    """ Function which returns author name as stored for filtering. """
+    return (name or '').lower()
+
+
+def get_author_names(author: Author) -> Dict[str, str]:
+    """ Function which returns normalised names of passed author
+    as BookAuthor field values. """
+    return {
+        'author_first_name': normalise_name(author.first_name),
+        'author_second_name': normalise_name(author.second_name),
+        'author_last_name': normalise_name(author.last_name),
+    }
+
+
+def update_author_names(authors: Iterable[Author],
+                        book_ids: Optional[Iterable[int]] = None) -> int:
+    """ Function which stores normalised names of passed authors
+    in their relations (limited to passed books if given)
+    and returns the number of updated relations. """
+    relations = BookAuthor.objects.all()
+    if book_ids is not None:
+        relations = relations.filter(book_id__in=list(book_ids))
+    updated = 0
+    for author in authors:
+        updated += relations.filter(author_id=author.pk).update(
+            **get_author_names(author))
+    return updated
+
+
+def iter_backfill_author_names(chunk_size: int = BACKFILL_CHUNK_SIZE
+                               ) -> Iterator[int]:
+    """ Generator which stores normalised names in all relations,
+    authors in chunks of passed size (keyset on id, one transaction
+    per chunk), and yields the number of updated relations per chunk. """
+    last_id = 0
+    while True:
+        authors = list(Author.objects.filter(
+            id__gt=last_id).order_by('id')[:chunk_size])
+        if not authors:
+            break
+        with transaction.atomic():
+            yield update_author_names(authors)
+        last_id = authors[-1].id
+
+
+def get_lookups(values: Dict[str, str]) -> Dict[str, str]:
+    """ Function which returns BookAuthor lookups of passed
+    author name filters (AUTHOR_FILTERS keys), skipping empty values. """
+    return {AUTHOR_FILTERS[name]: normalise_name(value)
+            for name, value in values.items() if value}
+
+
+def filter_by_authors(queryset: QuerySet,
+                      values: Dict[str, str]) -> QuerySet:
+    """ Function which filters books by passed author name filters
+    with one subquery over normalised names of relations, so all filters
+    match the same author and books are never duplicated. The subquery
+    is uncorrelated (id IN), because SQLite doesn't turn EXISTS
+    into a semi-join and would probe relations for every book. """
+    lookups = get_lookups(values)
+    if not lookups:
+        return queryset
+    return queryset.filter(id__in=BookAuthor.objects.filter(
+        **lookups).values('book_id'))
+
+
+class AuthorFiltersMixin:
+    """ FilterSet mixin which applies author name filters (declared
+    without a method) together with filter_by_authors,
+    after all other filters. """
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        authors = {}
+        for name, value in self.form.cleaned_data.items():
+            if name in AUTHOR_FILTERS:
+                authors[name] = value
+            else:
+                queryset = self.filters[name].filter(queryset, value)
+        return filter_by_authors(queryset, authors)
+
+
+def update_author_names_on_save(sender, instance: Author, created: bool,
+                                **kwargs) -> None:
+    """ Signal handler which updates names of saved author's relations. """
+    if not created:
+        update_author_names([instance])
+
+
+def fill_author_names_on_create(sender, instance: BookAuthor, created: bool,
+                                **kwargs) -> None:
+    """ Signal handler which fills names of a created relation. """
+    if created:
+        update_author_names([instance.author], [instance.book_id])
+
+
+def fill_author_names_on_add(sender, instance, action: str, reverse: bool,
+                             pk_set=None, **kwargs) -> None:
+    """ Signal handler which fills names of relations added
+    with Book.authors or Author.books managers. """
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        update_author_names([instance], pk_set)
+    else:
+        update_author_names(Author.objects.filter(pk__in=pk_set),
+                            [instance.pk])
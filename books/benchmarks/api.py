@@ -0,0 +1,14 @@
+from typing import Dict, Any
+from django.urls import reverse
+
+from api.filters import BookFilter
+from books.benchmarks.filters import get_filter_cases
+from books.benchmarks.utils import measure_requests
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of /api/books/ latency for representative queries. """
+    cases = [('all', {})] + [
+        (name, params) for name, filterset_class, params
+        in get_filter_cases() if filterset_class is BookFilter]
+    return measure_requests(reverse('book-list'), cases, repeat)
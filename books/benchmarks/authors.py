@@ -0,0 +1,74 @@
+from typing import Dict, Any, List, Tuple
+from django.db.models import Exists, OuterRef, QuerySet
+
+from books.models import Author, Book, BookAuthor
+from books.author_search import filter_by_authors, get_lookups
+from books.benchmarks.filters import analyze
+from books.benchmarks.utils import measure
+
+
+PAGE_SIZE = 100
+JOIN_LOOKUPS = {
+    'authors__first_name': 'authors__first_name__iexact',
+    'authors__second_name': 'authors__second_name__icontains',
+    'authors__last_name': 'authors__last_name__iexact',
+}
+
+
+def get_author_cases() -> List[Tuple[str, Dict[str, str]]]:
+    """ Function which returns representative author filters
+    built from values existing in the database. """
+    author = Author.objects.exclude(second_name='').order_by(
+        'id')[Author.objects.exclude(second_name='').count() // 2]
+    return [
+        ('first_name', {'authors__first_name': author.first_name}),
+        ('last_name', {'authors__last_name': author.last_name}),
+        ('full_name', {'authors__first_name': author.first_name,
+                       'authors__last_name': author.last_name}),
+        ('first_and_second_name', {
+            'authors__first_name': author.first_name,
+            'authors__second_name': author.second_name[:3]}),
+    ]
+
+
+def join_distinct(params: Dict[str, str]) -> QuerySet:
+    """ Function which filters books joining authors in one filter()
+    call (the same author), with DISTINCT removing duplicated books. """
+    return Book.objects.filter(**{
+        JOIN_LOOKUPS[name]: value for name, value in params.items()}).distinct()
+
+
+def exists(params: Dict[str, str]) -> QuerySet:
+    """ Function which filters books with a correlated EXISTS subquery. """
+    return Book.objects.filter(Exists(BookAuthor.objects.filter(
+        book_id=OuterRef('pk'), **get_lookups(params))))
+
+
+def subquery(params: Dict[str, str]) -> QuerySet:
+    """ Function which filters books with filter_by_authors. """
+    return filter_by_authors(Book.objects.all(), params)
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of author filters: join with DISTINCT
+    against a correlated EXISTS subquery over relations. """
+    analyze()
+    results = {}
+    for name, params in get_author_cases():
+        results[name] = {'params': params}
+        ids = {}
+        for plan, filter_books in [('join_distinct', join_distinct),
+                                   ('exists', exists),
+                                   ('subquery', subquery)]:
+            queryset = filter_books(params)
+            page = queryset.order_by('title', 'id')[:PAGE_SIZE]
+            results[name][plan] = {
+                'page': measure(lambda: list(page.all()), repeat),
+                'count': measure(queryset.count, repeat),
+                'rows': queryset.count(),
+                'plan': page.explain(),
+            }
+            ids[plan] = list(page.values_list('id', flat=True))
+        results[name]['identical'] = \
+            ids['join_distinct'] == ids['exists'] == ids['subquery']
+    return results
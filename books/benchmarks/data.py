@@ -0,0 +1,101 @@
+import random
+from typing import Dict, Any, List
+
+from books.models import Author, Book, BookAuthor, Language
+from books.author_search import get_author_names
+
+
+FIRST_NAMES = [
+    'Adam', 'Anna', 'Bolesław', 'Czesław', 'Dorota', 'Ewa', 'Fryderyk',
+    'Gabriela', 'Henryk', 'Irena', 'Jan', 'Julian', 'Katarzyna', 'Leopold',
+    'Maria', 'Olga', 'Piotr', 'Stanisław', 'Tadeusz', 'Wisława', 'Zofia',
+    'Agatha', 'Charles', 'George', 'Jane', 'Mark', 'Virginia', 'William']
+SECOND_NAMES = ['', '', '', 'Maria', 'Christian', 'Ronald', 'J.', 'Kathleen']
+SYLLABLES = [
+    'ka', 'ro', 'wi', 'ski', 'ew', 'mar', 'no', 'an', 'der', 'sen',
+    'tol', 'kien', 'ow', 'icz', 'pru', 'sza', 'ty', 'ber', 'lin', 'son']
+WORDS = [
+    'night', 'river', 'garden', 'king', 'winter', 'shadow', 'letters',
+    'journey', 'forest', 'city', 'sea', 'war', 'peace', 'stone', 'glass',
+    'crown', 'dream', 'house', 'road', 'storm', 'silence', 'fire', 'moon']
+BATCH_SIZE = 5000
+
+
+def generate_catalogue(books: int = 100000, authors: int = 30000,
+                       languages: int = 50, seed: int = 0) -> Dict[str, int]:
+    """ Function which fills the database with a synthetic catalogue
+    (1-3 authors per book, skewed language distribution)
+    and returns the number of created objects. """
+    rng = random.Random(seed)
+    Language.objects.bulk_create([
+        Language(language=f'Language {i}', shortcut=f'l{i}')
+        for i in range(languages)])
+    language_ids = list(Language.objects.values_list('id', flat=True))
+
+    author_names = set()
+    while len(author_names) < authors:
+        last_name = ''.join(rng.choice(SYLLABLES)
+                            for i in range(rng.randint(2, 4))).capitalize()
+        author_names.add((rng.choice(FIRST_NAMES), last_name))
+    Author.objects.bulk_create([
+        Author(first_name=first_name, second_name=rng.choice(SECOND_NAMES),
+               last_name=last_name)
+        for first_name, last_name in sorted(author_names)],
+        batch_size=BATCH_SIZE)
+    author_objects = list(Author.objects.all())
+
+    book_keys = set()
+    while len(book_keys) < books:
+        title = ' '.join(rng.choice(WORDS)
+                         for i in range(rng.randint(1, 4))).capitalize()
+        language_id = language_ids[
+            min(int(rng.expovariate(0.3)), len(language_ids) - 1)]
+        book_keys.add((title, rng.randint(1900, 2020), language_id))
+    Book.objects.bulk_create([
+        Book(title=title, publication_year=year, language_id=language_id,
+             isbn=rng.randint(10**12, 10**13 - 1),
+             page_count=rng.randint(30, 1200))
+        for title, year, language_id in sorted(book_keys)],
+        batch_size=BATCH_SIZE)
+
+    relations = []
+    for book_id in Book.objects.values_list('id', flat=True).iterator():
+        for author in rng.sample(author_objects, rng.choice([1, 1, 1, 2, 3])):
+            relations.append(BookAuthor(
+                book_id=book_id, author_id=author.id,
+                **get_author_names(author)))
+    BookAuthor.objects.bulk_create(relations, batch_size=BATCH_SIZE)
+    return {
+        'books': books,
+        'authors': authors,
+        'languages': languages,
+        'book_authors': len(relations),
+    }
+
+
+def generate_volumes(count: int = 2000, languages: int = 50,
+                     seed: int = 0) -> List[Dict[str, Any]]:
+    """ Function which returns synthetic Google Books volumes
+    with titles not present in the generated catalogue. """
+    rng = random.Random(seed)
+    volumes = []
+    for i in range(count):
+        authors = [
+            f"{rng.choice(FIRST_NAMES)} "
+            f"{''.join(rng.choice(SYLLABLES) for j in range(3)).capitalize()}"
+            for j in range(rng.choice([1, 1, 1, 2, 3]))]
+        volumes.append({
+            'volumeInfo': {
+                'title': f"{rng.choice(WORDS).capitalize()} volume {i}",
+                'authors': authors,
+                'pageCount': rng.randint(30, 1200),
+                'publishedDate': f"{rng.randint(1900, 2020)}-01-01",
+                'language': f"l{min(int(rng.expovariate(0.3)), languages - 1)}",
+                'imageLinks': {'thumbnail': f'https://covers.example/{i}'},
+                'industryIdentifiers': [{
+                    'type': 'ISBN_13',
+                    'identifier': str(rng.randint(10**12, 10**13 - 1)),
+                }],
+            },
+        })
+    return volumes
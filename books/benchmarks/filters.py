@@ -0,0 +1,86 @@
+from typing import Dict, Any, List, Tuple
+from django.db import connection
+
+from books.models import Author, Book, BookAuthor
+from books.db import create_case_insensitive_indexes, drop_case_insensitive_indexes
+from books.filters import BookFilter
+from api.filters import BookFilter as ApiBookFilter
+from books.benchmarks.utils import measure
+
+
+INDEXED_MODELS = [Book, BookAuthor]
+
+
+def get_filter_cases() -> List[Tuple[str, Any, Dict[str, str]]]:
+    """ Function which returns representative BookFilter queries
+    built from values existing in the database. """
+    author = Author.objects.order_by('id')[Author.objects.count() // 2]
+    book = Book.objects.select_related('language').order_by(
+        'id')[Book.objects.count() // 2]
+    return [
+        ('author_last_name', ApiBookFilter,
+         {'authors__last_name': author.last_name.upper()}),
+        ('author_full_name', ApiBookFilter,
+         {'authors__first_name': author.first_name.lower(),
+          'authors__last_name': author.last_name.lower()}),
+        ('title_iexact', ApiBookFilter, {'title__iexact': book.title.upper()}),
+        ('title_contains', ApiBookFilter,
+         {'title__contains': book.title.split()[0]}),
+        ('language_shortcut', ApiBookFilter,
+         {'language__shortcut': book.language.shortcut}),
+        ('year_range', ApiBookFilter,
+         {'publication_year_min': '1990', 'publication_year_max': '1995'}),
+        ('year_range_language', BookFilter,
+         {'publication_year_min': '1990', 'publication_year_max': '1995',
+          'language': str(book.language_id)}),
+    ]
+
+
+def drop_indexes() -> None:
+    """ Function which drops indexes used by BookFilter lookups. """
+    drop_case_insensitive_indexes()
+    with connection.schema_editor() as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+
+
+def create_indexes() -> None:
+    """ Function which (re)creates indexes used by BookFilter lookups. """
+    create_case_insensitive_indexes()
+    with connection.schema_editor() as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                editor.add_index(model, index)
+
+
+def analyze() -> None:
+    """ Function which refreshes query planner statistics. """
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+def run_cases(cases: List[Tuple[str, Any, Dict[str, str]]],
+              repeat: int) -> Dict[str, Any]:
+    """ Function which measures passed filter queries. """
+    results = {}
+    for name, filterset_class, params in cases:
+        queryset = filterset_class(params, queryset=Book.objects.all()).qs
+        result = measure(lambda: list(queryset.all()), repeat)
+        result['rows'] = queryset.count()
+        result['plan'] = queryset.explain()
+        results[name] = result
+    return results
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of BookFilter queries without and with indexes. """
+    cases = get_filter_cases()
+    drop_indexes()
+    analyze()
+    before = run_cases(cases, repeat)
+    create_indexes()
+    analyze()
+    after = run_cases(cases, repeat)
+    return {'without_indexes': before, 'with_indexes': after}
@@ -0,0 +1,75 @@
+from typing import Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+from django.db import transaction
+
+from books.external_api import ExternalApi, ImportResult, MAX_RESULTS
+from books.languages import language_resolver
+from books.models import Language
+from books.benchmarks.data import generate_volumes
+from books.benchmarks.utils import measure
+
+
+FEED_URL = 'https://feed.example/books/v1/volumes?q=benchmark'
+BULK_VOLUMES = 2000
+SINGLE_VOLUMES = 200
+
+
+class FakeResponse:
+    """ Response of the fake feed. """
+
+    status_code = 200
+    reason = 'OK'
+    headers = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def json(self) -> Dict[str, Any]:
+        return self.data
+
+
+class FakeSession:
+    """ HTTP session serving passed volumes as Google Books
+    result pages, without any network access. """
+
+    def __init__(self, volumes: List[Dict[str, Any]]):
+        self.volumes = volumes
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        query = parse_qs(urlparse(url).query)
+        start_index = int(query.get('startIndex', [0])[0])
+        max_results = int(query.get('maxResults', [MAX_RESULTS])[0])
+        return FakeResponse({
+            'totalItems': len(self.volumes),
+            'items': self.volumes[start_index:start_index + max_results],
+        })
+
+
+def import_volumes(volumes: List[Dict[str, Any]],
+                   bulk: bool) -> ImportResult:
+    """ Function which crawls passed volumes from the fake feed
+    and rolls the import back, so every run starts from the same data. """
+    external_api = ExternalApi(
+        FEED_URL, session=FakeSession(volumes), use_cache=False)
+    with transaction.atomic():
+        result = external_api.import_books(bulk=bulk, crawl=True)
+        transaction.set_rollback(True)
+    language_resolver.invalidate()
+    return result
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of ExternalApi import throughput against a fake feed. """
+    volumes = generate_volumes(
+        BULK_VOLUMES, languages=max(Language.objects.count(), 1))
+    results = {}
+    for name, count, bulk in [('bulk', BULK_VOLUMES, True),
+                              ('single', SINGLE_VOLUMES, False)]:
+        result = measure(lambda: import_volumes(volumes[:count], bulk), repeat)
+        result['volumes'] = count
+        import_result = import_volumes(volumes[:count], bulk)
+        result['created'] = import_result.created
+        result['stages'] = import_result.as_dict()['timings']
+        result['volumes_per_s'] = round(count / result['median_ms'] * 1000, 1)
+        results[name] = result
+    return results
@@ -0,0 +1,39 @@
+from typing import Dict, Any
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.benchmarks.utils import measure
+from api.serializers import BOOK_FIELDS, BookSerializer, get_book_values, serialize_book_rows
+from api.views import BookViewSet
+
+
+PAGE_SIZES = [100, 1000]
+
+
+def render_serializer(page_size: int) -> bytes:
+    """ Function which renders a page of books with BookSerializer. """
+    books = BookViewSet.queryset.order_by('title', 'id')[:page_size]
+    return JSONRenderer().render(BookSerializer(books, many=True).data)
+
+
+def render_rows(page_size: int) -> bytes:
+    """ Function which renders a page of books from values() rows. """
+    rows = list(Book.objects.order_by(
+        'title', 'id').values(*get_book_values(BOOK_FIELDS))[:page_size])
+    return JSONRenderer().render(serialize_book_rows(rows))
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of book list serialisation: BookSerializer
+    against values() rows with the pre-grouped author map. """
+    results = {}
+    for page_size in PAGE_SIZES:
+        serializer = measure(lambda: render_serializer(page_size), repeat)
+        rows = measure(lambda: render_rows(page_size), repeat)
+        results[page_size] = {
+            'serializer': serializer,
+            'rows': rows,
+            'identical': render_serializer(page_size) == render_rows(page_size),
+            'speedup': round(serializer['median_ms'] / rows['median_ms'], 2),
+        }
+    return results
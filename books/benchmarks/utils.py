@@ -0,0 +1,75 @@
+import statistics
+import time
+from typing import Callable, Dict, Any, List, Tuple
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, override_settings
+
+
+# Benchmarks clear and fill the cache, so they run with a cache
+# of their own instead of the (possibly shared) default one.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark',
+    }
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """ Function which calls passed function `repeat` times (after one
+    warm-up call) and returns timings in milliseconds
+    with the number of executed queries. """
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        func()
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'queries': len(queries),
+    }
+
+
+def measure_requests(url: str, cases: List[Tuple[str, Dict[str, str]]],
+                     repeat: int = 5) -> Dict[str, Any]:
+    """ Function which measures GET requests of passed URL
+    with query parameters of every case, without the response cache
+    (cleared before every request) and served from it. Requests use
+    BENCHMARK_CACHES, so the default cache is left untouched. """
+    client = Client()
+    results = {}
+    with override_settings(ALLOWED_HOSTS=['testserver'],
+                           CACHES=BENCHMARK_CACHES):
+        for name, params in cases:
+            def get() -> HttpResponse:
+                response = client.get(url, params)
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f'GET {url} ({name}) returned '
+                        f'status {response.status_code}')
+                return response
+
+            def get_uncached() -> HttpResponse:
+                cache.clear()
+                return get()
+
+            response = get_uncached()
+            results[name] = {
+                'params': params,
+                'bytes': len(response.content),
+                'uncached': measure(get_uncached, repeat),
+                'cached': measure(get, repeat),
+            }
+    return results
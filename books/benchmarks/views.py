@@ -0,0 +1,53 @@
+from typing import Dict, Any
+from django.core.cache import cache
+from django.urls import reverse
+
+from books.models import Book
+from books.views import BookFilterListView
+from books.filters import BookFilter
+from books.pagination import COUNT_LIMIT, get_cached_count
+from books.benchmarks.filters import get_filter_cases
+from books.benchmarks.utils import measure, measure_requests
+
+
+def measure_counts(params: Dict[str, str], repeat: int) -> Dict[str, Any]:
+    """ Function which measures counting filtered books: exact,
+    limited to COUNT_LIMIT and taken from the cache. """
+    queryset = BookFilter(params, queryset=Book.objects.all()).qs
+
+    def limited_count():
+        cache.delete('count:benchmark')
+        return get_cached_count(queryset, 'count:benchmark')
+
+    return {
+        'exact': measure(queryset.count, repeat),
+        'limited': measure(limited_count, repeat),
+        'cached': measure(
+            lambda: get_cached_count(queryset, 'count:benchmark'), repeat),
+        'limit': COUNT_LIMIT,
+    }
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    """ Benchmark of the HTML book list render time and query counts,
+    and of counting listed books. """
+    cases = {name: params for name, filterset_class, params
+             in get_filter_cases()}
+    deep_page = max(min(Book.objects.count(), COUNT_LIMIT)
+                    // BookFilterListView.paginate_by, 1)
+    list_cases = [
+        ('all', {}),
+        ('deep_page', {'page': str(deep_page)}),
+        ('author_last_name', cases['author_last_name']),
+        ('title_icontains', {'title__icontains': cases['title_contains'][
+            'title__contains']}),
+        ('year_range_language', {
+            'publication_year_min': '1990',
+            'publication_year_max': '1995',
+            'language': cases['year_range_language']['language']}),
+    ]
+    results = measure_requests(reverse('books:book-list'), list_cases, repeat)
+    results['counts'] = {
+        name: measure_counts(params, repeat) for name, params in list_cases
+        if 'page' not in params}
+    return results
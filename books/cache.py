@@ -0,0 +1,147 @@
+import hashlib
+import time
+from typing import Iterable, Optional, Dict, List
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import QueryDict
+
+from books.models import Book, BookAuthor
+
+
+CATALOGUE_VERSION_KEY = 'books:catalogue-version'
+LISTING_CACHE_TIMEOUT = getattr(settings, 'BOOK_LISTING_CACHE_TIMEOUT', 600)
+ROW_CACHE_TIMEOUT = getattr(settings, 'BOOK_ROW_CACHE_TIMEOUT', 3600)
+
+
+def get_catalogue_version() -> int:
+    """ Function which returns the catalogue version, a timestamp
+    in microseconds changed on every write to books, authors
+    or languages. """
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns() // 1000, None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version() -> None:
+    """ Function which changes the catalogue version,
+    so cached listings are not used anymore. """
+    version = cache.get(CATALOGUE_VERSION_KEY) or 0
+    cache.set(CATALOGUE_VERSION_KEY,
+              max(version + 1, time.time_ns() // 1000), None)
+
+
+def invalidate_catalogue(using: str = 'default', **kwargs) -> None:
+    """ Function (and signal handler) which bumps the catalogue version
+    now and again after commit, so listings cached while the transaction
+    was open are not used either. """
+    bump_catalogue_version()
+    transaction.on_commit(bump_catalogue_version, using=using)
+
+
+def get_listing_cache_key(prefix: str, params: QueryDict,
+                          filterset_class, extra: Iterable[str] = (),
+                          version: Optional[int] = None) -> str:
+    """ Function which returns a cache key of a filtered listing,
+    built from the catalogue version and normalised query parameters
+    (filter and passed extra parameters only, without empty values,
+    in sorted order). Only the value read by filters and views is used,
+    the last one of a repeated parameter. """
+    names = list(filterset_class.base_filters)
+    normalised = []
+    for key in sorted(params):
+        if key not in extra and not any(
+                key == name or key.startswith(f'{name}_') for name in names):
+            continue
+        value = params.get(key)
+        if value:
+            normalised.append((key, value))
+    digest = hashlib.md5(urlencode(normalised).encode()).hexdigest()
+    if version is None:
+        version = get_catalogue_version()
+    return f'books:listing:{prefix}:{version}:{digest}'
+
+
+def get_catalogue_etag(request, *args, **kwargs) -> str:
+    """ Function which returns ETag of a catalogue listing, derived
+    from the catalogue version and the requested representation. """
+    representation = '|'.join([
+        str(get_catalogue_version()),
+        request.get_host(),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', '')])
+    return hashlib.md5(representation.encode()).hexdigest()
+
+
+def get_object_versions(kind: str, ids: Iterable[int]) -> Dict[int, int]:
+    """ Function which returns versions of passed objects (books, authors
+    or languages) with a single cache read, missing versions
+    are initialised with the current timestamp. """
+    keys = {f'books:version:{kind}:{pk}': pk for pk in ids}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() // 1000
+               for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_object_versions(kind: str, ids: Iterable[int]) -> None:
+    """ Function which changes versions of passed objects. """
+    version = time.time_ns() // 1000
+    keys = [f'books:version:{kind}:{pk}' for pk in ids]
+    current = cache.get_many(keys)
+    cache.set_many({
+        key: max(current.get(key, 0) + 1, version) for key in keys}, None)
+
+
+def get_book_row_versions(books: List[Book]) -> Dict[int, str]:
+    """ Function which returns a version of every passed book's row,
+    composed of versions of the book, its language and its authors
+    (which have to be prefetched). """
+    keys = {}
+    for book in books:
+        keys[('book', book.pk)] = None
+        keys[('language', book.language_id)] = None
+        for author in book.authors.all():
+            keys[('author', author.pk)] = None
+    versions = {}
+    for kind in ['book', 'language', 'author']:
+        for pk, version in get_object_versions(
+                kind, [pk for key_kind, pk in keys if key_kind == kind]).items():
+            versions[(kind, pk)] = version
+    return {
+        book.pk: '.'.join(
+            [str(versions[('book', book.pk)]),
+             str(versions[('language', book.language_id)])] +
+            [f"{author.pk}-{versions[('author', author.pk)]}"
+             for author in book.authors.all()])
+        for book in books}
+
+
+def invalidate_object_version(sender, instance, **kwargs) -> None:
+    """ Signal handler which changes the version of saved
+    or deleted book, author, language or the book of a relation. """
+    if sender is BookAuthor:
+        bump_object_versions('book', [instance.book_id])
+    else:
+        bump_object_versions(sender._meta.model_name, [instance.pk])
+
+
+def invalidate_book_authors_version(sender, instance, action: str,
+                                    reverse: bool, pk_set=None,
+                                    **kwargs) -> None:
+    """ Signal handler which changes versions of books
+    (and authors when changed from the author side)
+    after their authors were changed. """
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        bump_object_versions('author', [instance.pk])
+        bump_object_versions('book', pk_set or [])
+    else:
+        bump_object_versions('book', [instance.pk])
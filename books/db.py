@@ -0,0 +1,132 @@
+from django.db import connections
+
+from books.models import Author, Book, BookAuthor
+
+
+CASE_INSENSITIVE_INDEXES = [
+    ('books_author_first_name_ci', Author, 'first_name'),
+    ('books_author_last_name_ci', Author, 'last_name'),
+    ('books_book_title_ci', Book, 'title'),
+]
+CASE_INSENSITIVE_INDEX_SQL = {
+    'sqlite': 'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column} COLLATE NOCASE)',
+    'postgresql': 'CREATE INDEX IF NOT EXISTS {name} ON {table} (UPPER({column}))',
+}
+
+
+def create_case_insensitive_indexes(using: str = 'default') -> None:
+    """ Function which creates indexes used by iexact lookups
+    (LIKE on SQLite, UPPER() comparison on PostgreSQL),
+    which can't be declared with Meta.indexes. """
+    connection = connections[using]
+    sql = CASE_INSENSITIVE_INDEX_SQL.get(connection.vendor)
+    if not sql:
+        return
+    with connection.cursor() as cursor:
+        for name, model, column in CASE_INSENSITIVE_INDEXES:
+            cursor.execute(sql.format(
+                name=name, table=model._meta.db_table, column=column))
+
+
+def drop_case_insensitive_indexes(using: str = 'default') -> None:
+    """ Function which drops indexes created by
+    create_case_insensitive_indexes. """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for name, model, column in CASE_INSENSITIVE_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+SEARCH_TABLE = 'books_book_fts'
+SEARCH_AUTHORS_SQL = """COALESCE((
+    SELECT group_concat(
+        author.first_name || ' ' || author.second_name || ' ' || author.last_name, ' ')
+    FROM {author} AS author
+    JOIN {book_author} AS book_author ON book_author.author_id = author.id
+    WHERE book_author.book_id = {book_id}), '')"""
+SEARCH_TABLE_SQL = f"""CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+    title, authors, tokenize = 'unicode61 remove_diacritics 2')"""
+SEARCH_TRIGGERS_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS {search}_book_insert
+    AFTER INSERT ON {book} BEGIN
+        INSERT INTO {search} (rowid, title, authors)
+        VALUES (new.id, new.title, {authors_new});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {search}_book_update
+    AFTER UPDATE OF title ON {book} BEGIN
+        UPDATE {search} SET title = new.title WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {search}_book_delete
+    AFTER DELETE ON {book} BEGIN
+        DELETE FROM {search} WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {search}_book_author_insert
+    AFTER INSERT ON {book_author} BEGIN
+        UPDATE {search} SET authors = {authors_new_book}
+        WHERE rowid = new.book_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {search}_book_author_delete
+    AFTER DELETE ON {book_author} BEGIN
+        UPDATE {search} SET authors = {authors_old_book}
+        WHERE rowid = old.book_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {search}_author_update
+    AFTER UPDATE ON {author} BEGIN
+        UPDATE {search} SET authors = {authors_rowid}
+        WHERE rowid IN (
+            SELECT book_id FROM {book_author} WHERE author_id = new.id);
+    END""",
+]
+
+
+def get_search_sql_params() -> dict:
+    """ Returns table names and author subqueries used in search SQL. """
+    tables = {
+        'search': SEARCH_TABLE,
+        'book': Book._meta.db_table,
+        'author': Author._meta.db_table,
+        'book_author': BookAuthor._meta.db_table,
+    }
+    for name, book_id in [('authors_new', 'new.id'),
+                          ('authors_new_book', 'new.book_id'),
+                          ('authors_old_book', 'old.book_id'),
+                          ('authors_rowid', f'{SEARCH_TABLE}.rowid'),
+                          ('authors_book', 'book.id')]:
+        tables[name] = SEARCH_AUTHORS_SQL.format(book_id=book_id, **tables)
+    return tables
+
+
+def rebuild_search_index(using: str = 'default') -> None:
+    """ Function which fills the full-text search table
+    with all books and their authors. """
+    params = get_search_sql_params()
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute("""
+            INSERT INTO {search} (rowid, title, authors)
+            SELECT book.id, book.title, {authors_book}
+            FROM {book} AS book""".format(**params))
+
+
+def create_search_index(using: str = 'default') -> None:
+    """ Function which creates SQLite FTS5 table over book titles
+    and author names, kept in sync with writes by triggers. """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    params = get_search_sql_params()
+    with connection.cursor() as cursor:
+        exists = SEARCH_TABLE in connection.introspection.table_names(cursor)
+        if not exists:
+            cursor.execute(SEARCH_TABLE_SQL)
+        for sql in SEARCH_TRIGGERS_SQL:
+            cursor.execute(sql.format(**params))
+    if not exists:
+        rebuild_search_index(using)
+
+
+def create_database_objects(sender, using: str = 'default', **kwargs) -> None:
+    """ Post migrate signal handler which creates database objects
+    not managed by migrations. """
+    create_case_insensitive_indexes(using)
+    create_search_index(using)
@@ -0,0 +1,76 @@
+import csv
+import json
+from typing import Dict, Any, Iterator
+
+from books.models import Book
+
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = [
+    'title',
+    'authors',
+    'publication_year',
+    'language',
+    'isbn',
+    'page_count',
+    'cover_link']
+
+
+class Echo:
+    """ Pseudo-buffer which returns written value instead of storing it. """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_books(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """ Generator which walks the whole catalogue in chunks of passed size
+    (keyset on id, authors and language fetched per chunk)
+    and yields books as dictionaries. """
+    last_id = 0
+    while True:
+        chunk = list(Book.objects.filter(id__gt=last_id).order_by(
+            'id').select_related('language').prefetch_related(
+            'authors')[:chunk_size])
+        if not chunk:
+            break
+        for book in chunk:
+            yield {
+                'title': book.title,
+                'authors': [
+                    {
+                        'first_name': author.first_name,
+                        'second_name': author.second_name,
+                        'last_name': author.last_name
+                    } for author in book.authors.all()],
+                'publication_year': book.publication_year,
+                'language': book.language.shortcut,
+                'isbn': book.isbn,
+                'page_count': book.page_count,
+                'cover_link': book.cover_link,
+            }
+        last_id = chunk[-1].id
+
+
+def iter_ndjson(books: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """ Generator which yields passed books as NDJSON lines. """
+    for book in books:
+        yield json.dumps(book, ensure_ascii=False) + '\n'
+
+
+def iter_csv(books: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """ Generator which yields passed books as CSV lines,
+    with authors joined by semicolons. """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for book in books:
+        book['authors'] = '; '.join(
+            ' '.join(name for name in author.values() if name)
+            for author in book['authors'])
+        yield writer.writerow([book[field] for field in EXPORT_FIELDS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
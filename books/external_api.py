@@ -1,61 +1,386 @@
-from typing import Tuple, Dict, Any, Optional, List
+from typing import Tuple, Dict, Any, Optional, List, Iterator, Iterable, Callable
+import cProfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 import requests
+from django.db import transaction
 
-from books.models import Author, Book, Language
+from books.models import Author, Book, BookAuthor, Language
+from books.cache import invalidate_catalogue
+from books.languages import language_resolver
+from books.author_search import get_author_names
+from books.http_cache import get_default_cache
+
+
+BULK_BATCH_SIZE = 500
+MAX_RESULTS = 40
+CONCURRENCY = 4
+STAGES = ('fetch', 'parse', 'languages', 'authors', 'insert', 'm2m')
+PARSE_ERRORS = (KeyError, TypeError, ValueError, AttributeError)
+
+
+class ImportResult:
+    """ Class for import result: numbers of created, skipped (already
+    existing or duplicated) and failed (unparsable) volumes, fetch errors
+    and time spent in every import stage. Stage times are summed over
+    threads, so concurrent fetching may exceed the elapsed time. """
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        timings = ', '.join(f"{stage} {seconds:.3f} s"
+                            for stage, seconds in self.timings.items())
+        return f"created: {self.created}, skipped: {self.skipped}, " \
+            f"failed: {self.failed} in {self.elapsed:.3f} s ({timings})"
+
+    def __repr__(self):
+        return f"<ImportResult(created={self.created}, " \
+            f"skipped={self.skipped}, failed={self.failed})>"
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """ Context manager which adds time of its block to passed stage. """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.timings[name] += time.perf_counter() - start
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Returns the result as JSON serializable dictionary. """
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'errors': self.errors,
+            'elapsed': round(self.elapsed, 3),
+            'timings': {stage: round(seconds, 3)
+                        for stage, seconds in self.timings.items()},
+        }
 
 
 class ExternalApi:
     """ Class for fetching and import data from external API. """
 
     def __init__(self, url: str, headers: Dict[str, str] = {
-                 'Content-Type': 'application/json'}) -> None:
+                 'Content-Type': 'application/json'},
+                 concurrency: int = CONCURRENCY,
+                 session: Optional[requests.Session] = None,
+                 use_cache: bool = True) -> None:
         self.url = url
         self.headers = headers
+        self.concurrency = concurrency
+        self.session = session or self._create_session()
+        self.cache = get_default_cache() if use_cache else None
+        self.result = ImportResult()
+
+    def _create_session(self) -> requests.Session:
+        """ Function which creates HTTP session with a connection pool
+        big enough for concurrently fetched pages. """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
-    def import_books(self) -> int:
+    def import_books(self, bulk: bool = False,
+                     batch_size: int = BULK_BATCH_SIZE,
+                     crawl: bool = False,
+                     progress: Optional[Callable[[int], None]] = None,
+                     profile: Optional[str] = None) -> ImportResult:
         """ Function which imports books into the database
-        and returns the total number of imporeted books. """
-        total = 0
-        data, error = self._fetch_data()
-        if data:
-            for item in data['items']:
-                created = self._create_book_obj(item['volumeInfo'])
-                if created:
-                    total += 1
-        return total
-
-    def _fetch_data(self) -> Tuple[Dict[Any, Any], str]:
-        """ Function which fetchs data and returns
-        a json and error message if occurs. """
-        response = requests.get(self.url, headers=self.headers)
-        if response.status_code == 200:
-            data = response.json()
+        and returns the import result.
+        In bulk mode books are written in batches of passed size,
+        in crawl mode all result pages of the URL are imported.
+        Passed progress callback gets the running total after each batch,
+        with a profile path cProfile stats of the import are dumped there. """
+        return self.import_volumes(
+            self._iter_volumes(crawl), bulk, batch_size, progress, profile)
+
+    def import_volumes(self, volumes: Iterable[Dict[Any, Any]],
+                       bulk: bool = False,
+                       batch_size: int = BULK_BATCH_SIZE,
+                       progress: Optional[Callable[[int], None]] = None,
+                       profile: Optional[str] = None) -> ImportResult:
+        """ Function which imports passed book data (volumeInfo of items)
+        into the database and returns the import result. Only the calling
+        thread is profiled, pages fetched in the background are not. """
+        self.result = result = ImportResult()
+        profiler = cProfile.Profile() if profile else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            volumes = iter(volumes)
+            if bulk:
+                for batch in self._iter_batches(volumes, batch_size):
+                    self._bulk_create_book_objs(batch)
+                    if progress:
+                        progress(result.created)
+            else:
+                for book_data in volumes:
+                    self._create_book_obj(book_data)
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(profile)
+            result.elapsed = time.perf_counter() - start
+        return result
+
+    def _iter_volumes(self, crawl: bool = False) -> Iterator[Dict[Any, Any]]:
+        """ Generator which yields book data of fetched items,
+        page by page when crawling. """
+        if crawl:
+            pages = self._iter_pages()
+        else:
+            data, error = self._fetch_data()
+            pages = iter([data])
+        for data in pages:
+            for item in data.get('items', []):
+                yield item['volumeInfo']
+
+    def _iter_pages(self) -> Iterator[Dict[Any, Any]]:
+        """ Generator which follows startIndex of the URL's result set
+        and yields fetched pages in order until totalItems is exhausted.
+        Up to `concurrency` pages are fetched in the background
+        while the consumer processes the current one. """
+        data, error = self._fetch_data(0)
+        if not data.get('items'):
+            return
+        yield data
+        max_results = self._get_max_results()
+        start_indexes = iter(
+            range(max_results, data.get('totalItems', 0), max_results))
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = deque(
+                executor.submit(self._fetch_data, start_index)
+                for start_index in islice(start_indexes, self.concurrency))
+            try:
+                while pending:
+                    data, error = pending.popleft().result()
+                    if not data.get('items'):
+                        break
+                    for start_index in islice(start_indexes, 1):
+                        pending.append(
+                            executor.submit(self._fetch_data, start_index))
+                    yield data
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _iter_batches(self, volumes: Iterator[Dict[Any, Any]],
+                      batch_size: int) -> Iterator[List[Dict[Any, Any]]]:
+        """ Generator which splits book data into lists of passed size. """
+        while True:
+            batch = list(islice(volumes, batch_size))
+            if not batch:
+                break
+            yield batch
+
+    def _get_max_results(self) -> int:
+        """ Function which returns the page size used for crawling,
+        the URL's maxResults limited by the API maximum. """
+        query = parse_qs(urlparse(self.url).query)
+        return min(int(query.get('maxResults', [MAX_RESULTS])[0]),
+                   MAX_RESULTS)
+
+    def _get_page_url(self, start_index: int) -> str:
+        """ Function which returns the URL of result page
+        starting at passed index. """
+        url = urlparse(self.url)
+        query = parse_qs(url.query)
+        query.update({'startIndex': [start_index],
+                      'maxResults': [self._get_max_results()]})
+        return urlunparse(url._replace(query=urlencode(query, doseq=True)))
+
+    def _fetch_data(self, start_index: Optional[int] = None
+                    ) -> Tuple[Dict[Any, Any], str]:
+        """ Function which fetchs data (the result page starting
+        at passed index if given) and returns a json
+        and error message if occurs. Responses are taken from
+        the cache while fresh and revalidated with ETag when stale. """
+        url = self.url
+        if start_index is not None:
+            url = self._get_page_url(start_index)
+        headers = self.headers
+        with self.result.stage('fetch'):
+            entry = self.cache.get(url) if self.cache else None
+        if entry:
+            if self.cache.is_fresh(entry):
+                return entry['data'], ''
+            if entry['etag']:
+                headers = {**headers, 'If-None-Match': entry['etag']}
+        with self.result.stage('fetch'):
+            response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and entry:
+            data = entry['data']
             error = ''
+            self.cache.set(url, data, entry['etag'])
+        elif response.status_code == 200:
+            with self.result.stage('parse'):
+                data = response.json()
+            error = ''
+            if self.cache:
+                self.cache.set(url, data, response.headers.get('ETag'))
         else:
             data = {}
             error = response.reason
+            self.result.errors.append(f"{url}: {error}")
         return data, error
 
+    def _parse_book_data(self, book_data: Dict[Any, Any]
+                         ) -> Optional[Dict[str, Any]]:
+        """ Function which gets Book's demanded fields from passed book data,
+        returns None (and counts the volume as failed) when it can't be parsed. """
+        try:
+            title = self._get_title(book_data)
+            if not title:
+                raise ValueError('Missing title')
+            publication_year = self._get_publication_year(book_data)
+            if publication_year is None:
+                raise ValueError('Missing publication year')
+            language = book_data.get('language')
+            if not language or not isinstance(language, str):
+                raise ValueError('Missing language')
+            authors = book_data.get('authors') or []
+            if not isinstance(authors, list) or not all(
+                    isinstance(author, str) and author.split()
+                    for author in authors):
+                raise ValueError('Invalid authors')
+            return {
+                'title': title,
+                'publication_year': publication_year,
+                'isbn': self._get_isbn(book_data),
+                'page_count': self._get_page_count(book_data),
+                'cover_link': self._get_cover_link(book_data),
+            }
+        except PARSE_ERRORS:
+            self.result.failed += 1
+            return None
+
     def _create_book_obj(self, book_data: Dict[Any, Any]) -> bool:
         """ Function which gets Book's demandend fields from book data,
         and creates Book object (or gets from database if already exists). """
-        title = self._get_title(book_data)
-        publication_year = self._get_publication_year(book_data)
-        isbn = self._get_isbn(book_data)
-        page_count = self._get_page_count(book_data)
-        cover_link = self._get_cover_link(book_data)
-        language = self._create_language_obj(book_data)
-        authors = self._create_authors_obj(book_data)
-        book, created = Book.objects.get_or_create(
-            title=title, publication_year=publication_year, language=language)
+        result = self.result
+        with result.stage('parse'):
+            fields = self._parse_book_data(book_data)
+        if fields is None:
+            return False
+        with result.stage('languages'):
+            language = self._create_language_obj(book_data)
+        with result.stage('authors'):
+            authors = self._create_authors_obj(book_data)
+        with result.stage('insert'):
+            book, created = Book.objects.get_or_create(
+                title=fields['title'],
+                publication_year=fields['publication_year'],
+                language=language)
         if created:
-            book.isbn = isbn
-            book.page_count = page_count
-            book.cover_link = cover_link
-            book.authors.add(*authors)
-            book.save()
+            with result.stage('m2m'):
+                book.authors.add(*authors)
+            with result.stage('insert'):
+                book.isbn = fields['isbn']
+                book.page_count = fields['page_count']
+                book.cover_link = fields['cover_link']
+                book.save()
+            result.created += 1
+        else:
+            result.skipped += 1
         return created
 
+    def _bulk_create_book_objs(self, books_data: List[Dict[Any, Any]]) -> int:
+        """ Function which creates Book objects for a batch of book data
+        with a constant number of queries per batch, skips books which
+        already exist and returns the number of created books. """
+        result = self.result
+        parsed = []
+        author_names = {}
+        with result.stage('parse'):
+            for book_data in books_data:
+                fields = self._parse_book_data(book_data)
+                if fields is None:
+                    continue
+                parsed.append((book_data, fields))
+                for name in book_data.get('authors') or []:
+                    author_names[name] = None
+
+        languages = {}
+        with result.stage('languages'):
+            for book_data, fields in parsed:
+                shortcut = book_data.get('language')
+                if shortcut not in languages:
+                    languages[shortcut] = self._create_language_obj(book_data)
+
+        with transaction.atomic():
+            with result.stage('authors'):
+                author_names = list(author_names)
+                authors = dict(zip(
+                    author_names,
+                    Author.objects.get_or_create_many(author_names)))
+
+            with result.stage('insert'):
+                new_books = {}
+                for book_data, fields in parsed:
+                    language = languages[book_data.get('language')]
+                    key = (fields['title'], fields['publication_year'],
+                           language.id)
+                    if key not in new_books:
+                        new_books[key] = (book_data, fields, language)
+
+                titles = {title for title, year, language_id in new_books}
+                existing = Book.objects.filter(title__in=titles).values_list(
+                    'title', 'publication_year', 'language_id')
+                for key in existing:
+                    new_books.pop(key, None)
+
+                if new_books:
+                    Book.objects.bulk_create([
+                        Book(title=fields['title'],
+                             publication_year=fields['publication_year'],
+                             language=language, isbn=fields['isbn'],
+                             page_count=fields['page_count'],
+                             cover_link=fields['cover_link'])
+                        for book_data, fields, language
+                        in new_books.values()])
+                    titles = {title for title, year, language_id in new_books}
+                    book_ids = {
+                        (title, year, language_id): book_id
+                        for book_id, title, year, language_id
+                        in Book.objects.filter(title__in=titles).values_list(
+                            'id', 'title', 'publication_year', 'language_id')}
+
+            if new_books:
+                with result.stage('m2m'):
+                    relations = {}
+                    for key, (book_data, fields, language) in new_books.items():
+                        for name in book_data.get('authors') or []:
+                            author = authors[name]
+                            relations[(book_ids[key], author.id)] = author
+                    BookAuthor.objects.bulk_create([
+                        BookAuthor(book_id=book_id, author_id=author_id,
+                                   **get_author_names(author))
+                        for (book_id, author_id), author
+                        in relations.items()])
+                invalidate_catalogue()
+        result.created += len(new_books)
+        result.skipped += len(parsed) - len(new_books)
+        return len(new_books)
+
     def _get_title(self, book_data: Dict[Any, Any]) -> str:
         """ Function which gets book title and subtitle from passed book data
         and returns joined title. """
@@ -68,7 +393,7 @@ class ExternalApi:
     def _create_authors_obj(self, book_data: Dict[Any, Any]) -> List[Author]:
         """ Function which gets list of authors from passed book data,
         returns a list with Author objects. """
-        authors = book_data.get('authors')
+        authors = book_data.get('authors') or []
         author_objects = Author.objects.get_or_create_many(authors)
         return author_objects
 
@@ -93,9 +418,7 @@ class ExternalApi:
         """ Function which gets language from passed book data,
         and returns a Language object. """
         language = book_data.get('language')
-        language_object, created = Language.objects.get_or_create(
-            shortcut=language)
-        return language_object
+        return language_resolver.get_or_create(language)
 
     def _get_cover_link(self, book_data: Dict[Any, Any]) -> str:
         """ Function which returns book cover link
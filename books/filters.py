@@ -1,16 +1,19 @@
 import django_filters as filters
 
 from books.models import Book
+from books.search import search_books
+from books.author_search import AuthorFiltersMixin
 
 
-class BookFilter(filters.FilterSet):
-    """ Book object filter class. """
+class BookFilter(AuthorFiltersMixin, filters.FilterSet):
+    """ Book object filter class, author filters match the same author. """
+    q = filters.CharFilter(method='filter_search', label="Search")
     authors__first_name = filters.CharFilter(
-        lookup_expr='iexact', label="Author's first name")
+        label="Author's first name")
     authors__second_name = filters.CharFilter(
-        lookup_expr='icontains', label="Author's other names")
+        label="Author's other names")
     authors__last_name = filters.CharFilter(
-        lookup_expr='iexact', label="Author's last name")
+        label="Author's last name")
     publication_year = filters.RangeFilter(label="Publication year range")
 
     class Meta:
@@ -19,3 +22,7 @@ class BookFilter(filters.FilterSet):
             'title': ['iexact', 'icontains'],
             'language': ['exact'],
         }
+
+    def filter_search(self, queryset, name, value):
+        """ Full-text search in titles and author names. """
+        return search_books(queryset, value)
@@ -17,3 +17,6 @@ class ApiImportForm(forms.Form):
         label='External API URL',
         required=True,
         validators=[validate_googleapis_hostname])
+    crawl = forms.BooleanField(
+        label='Import all result pages',
+        required=False)
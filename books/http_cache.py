@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from django.conf import settings
+
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+EVICT_INTERVAL = 100
+
+
+class ResponseCache:
+    """ Class storing JSON responses of external API on disk, one file
+    per URL, with time to live, ETag for revalidation and least recently
+    used files evicted above maximum directory size. The directory
+    is scanned on the first write, then only when the size estimated
+    from written files exceeds the maximum or every `evict_interval`
+    writes (to notice files written by other processes). """
+
+    def __init__(self, directory: str, ttl: int = DEFAULT_TTL,
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 evict_interval: int = EVICT_INTERVAL) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.evict_interval = evict_interval
+        self._size = None
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _get_path(self, url: str) -> Path:
+        """ Returns path of the file storing response of passed URL. """
+        return self.directory / f'{hashlib.sha256(url.encode()).hexdigest()}.json'
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """ Returns cached entry (data, etag, fetched_at) of passed URL
+        and marks it as recently used. """
+        path = self._get_path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """ Returns True when passed entry is younger than time to live. """
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def set(self, url: str, data: Dict[str, Any],
+            etag: Optional[str] = None) -> None:
+        """ Stores response data of passed URL
+        and evicts least recently used entries if needed. """
+        entry = {
+            'url': url,
+            'etag': etag,
+            'fetched_at': time.time(),
+            'data': data,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            written = os.path.getsize(tmp_path)
+            os.replace(tmp_path, self._get_path(url))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self._writes += 1
+            if self._size is not None:
+                self._size += written
+            if (self._size is None or self._size > self.max_size
+                    or self._writes >= self.evict_interval):
+                self.evict()
+
+    def evict(self) -> None:
+        """ Removes least recently used entries until the cache
+        fits in maximum size and stores the size left. """
+        files = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file_size for mtime, file_size, path in files)
+        for mtime, file_size, path in sorted(files):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= file_size
+        self._size = size
+        self._writes = 0
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """ Returns response cache configured in EXTERNAL_API_CACHE setting,
+    None when not configured. """
+    options = getattr(settings, 'EXTERNAL_API_CACHE', None)
+    if not options:
+        return None
+    return ResponseCache(
+        options['DIRECTORY'],
+        ttl=options.get('TTL', DEFAULT_TTL),
+        max_size=options.get('MAX_SIZE', DEFAULT_MAX_SIZE))
@@ -0,0 +1,68 @@
+import gzip
+import json
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def open_dump(path: str) -> TextIO:
+    """ Function which opens a (gzipped if .gz) dump file for reading. """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_documents(file: TextIO,
+                   chunk_size: int = READ_CHUNK_SIZE,
+                   on_error: Optional[Callable[[str], None]] = None
+                   ) -> Iterator[Any]:
+    """ Generator which incrementally parses concatenated JSON documents
+    (including JSON Lines) from passed file, reading it in chunks.
+    More data is read only while the error is on the last line
+    of the buffer (a document cut by the chunk end). A malformed document
+    is skipped up to the end of the line it starts on and its error
+    message passed to the callback, without a callback the error
+    is raised. """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while True:
+        chunk = file.read(chunk_size)
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position == len(buffer):
+                break
+            try:
+                document, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if chunk and buffer.find('\n', e.pos) == -1:
+                    break
+                if on_error is None:
+                    raise
+                on_error(e.msg)
+                end = buffer.find('\n', position)
+                position = len(buffer) if end == -1 else end + 1
+                continue
+            yield document
+        buffer = buffer[position:]
+        if not chunk:
+            break
+
+
+def iter_volumes(documents: Iterator[Any]) -> Iterator[Dict[Any, Any]]:
+    """ Generator which yields book data (volumeInfo) from passed
+    Google Books documents: result pages, volumes or bare volumeInfo,
+    other documents are ignored. """
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        if 'items' in document:
+            for item in document['items']:
+                yield item['volumeInfo']
+        elif 'volumeInfo' in document:
+            yield document['volumeInfo']
+        elif 'title' in document:
+            yield document
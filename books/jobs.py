@@ -0,0 +1,62 @@
+import os
+from datetime import timedelta
+from typing import Iterable, Optional
+from django.db.models import Q
+from django.utils import timezone
+
+from books.models import ImportJob
+from books.external_api import ExternalApi
+
+
+STALE_JOB_TIMEOUT = 30 * 60
+
+
+def run_import_job(job_id: int, profile_dir: Optional[str] = None) -> bool:
+    """ Function which claims a queued import job, imports books
+    from its URL and stores the result (with stage timings in the report).
+    With a profile directory cProfile stats are dumped there.
+    The heartbeat of the job is refreshed with every progress update.
+    Returns False when the job was already claimed by another worker. """
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.QUEUED).update(
+        status=ImportJob.RUNNING, started_at=now, heartbeat_at=now)
+    if not claimed:
+        return False
+
+    def progress(total: int) -> None:
+        ImportJob.objects.filter(pk=job_id).update(
+            total=total, heartbeat_at=timezone.now())
+
+    try:
+        job = ImportJob.objects.get(pk=job_id)
+        external_api = ExternalApi(job.url)
+        profile = None
+        if profile_dir:
+            profile = os.path.join(profile_dir, f'import-job-{job_id}.prof')
+        result = external_api.import_books(
+            bulk=True, crawl=job.crawl, progress=progress, profile=profile)
+    except Exception as e:
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJob.FAILED, error=str(e),
+            finished_at=timezone.now())
+    else:
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJob.DONE, total=result.created,
+            report=result.as_dict(), finished_at=timezone.now())
+    return True
+
+
+def requeue_stale_jobs(timeout: float = STALE_JOB_TIMEOUT,
+                       exclude: Iterable[int] = ()) -> int:
+    """ Function which queues again running jobs (except passed ones,
+    run by the caller) without a heartbeat for passed number of seconds,
+    left by workers which died after claiming them, and returns
+    the number of requeued jobs. Requeued jobs start over,
+    books imported before are skipped. """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return ImportJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff)
+        | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=ImportJob.RUNNING).exclude(pk__in=list(exclude)).update(
+        status=ImportJob.QUEUED, started_at=None, heartbeat_at=None)
@@ -0,0 +1,64 @@
+import time
+from typing import Dict, List
+from django.conf import settings
+
+from books.models import Language
+
+
+LANGUAGE_CACHE_TIMEOUT = getattr(settings, 'LANGUAGE_CACHE_TIMEOUT', 300)
+
+
+class LanguageResolver:
+    """ Class resolving language shortcuts to Language objects with
+    a process-wide cache, loaded with a single query and invalidated
+    on Language writes (and after a timeout, for writes made
+    by other processes). """
+
+    def __init__(self, timeout: int = LANGUAGE_CACHE_TIMEOUT) -> None:
+        self.timeout = timeout
+        self._languages = None
+        self._loaded_at = 0.0
+
+    def _get_languages(self) -> Dict[str, Language]:
+        """ Returns cached languages by shortcut, loading them if needed. """
+        languages = self._languages
+        if languages is None or time.monotonic() - self._loaded_at > self.timeout:
+            languages = {
+                language.shortcut: language
+                for language in Language.objects.all()}
+            self._languages = languages
+            self._loaded_at = time.monotonic()
+        return languages
+
+    def get_or_create(self, shortcut: str) -> Language:
+        """ Returns Language with passed shortcut, creates it
+        if doesn't exist. """
+        language = self._get_languages().get(shortcut)
+        if language is None:
+            language, created = Language.objects.get_or_create(
+                shortcut=shortcut)
+        return language
+
+    def get_ids(self, shortcut: str) -> List[int]:
+        """ Returns ids of languages with passed shortcut, compared
+        case-insensitively. Languages are reloaded when none matches,
+        in case one was created by another process. """
+        ids = self._find_ids(shortcut)
+        if not ids:
+            self.invalidate()
+            ids = self._find_ids(shortcut)
+        return ids
+
+    def _find_ids(self, shortcut: str) -> List[int]:
+        """ Returns ids of cached languages with passed shortcut. """
+        shortcut = shortcut.lower()
+        return [language.id
+                for language_shortcut, language in self._get_languages().items()
+                if language_shortcut.lower() == shortcut]
+
+    def invalidate(self, **kwargs) -> None:
+        """ Drops cached languages (usable as a signal handler). """
+        self._languages = None
+
+
+language_resolver = LanguageResolver()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from books.author_search import BACKFILL_CHUNK_SIZE, iter_backfill_author_names
+
+
+class Command(BaseCommand):
+    help = 'Stores normalised author names in all book-author relations, ' \
+        'used by author filters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=BACKFILL_CHUNK_SIZE,
+            help='Number of authors updated in one transaction.')
+
+    def handle(self, *args, **options):
+        total = 0
+        for updated in iter_backfill_author_names(options['chunk_size']):
+            total += updated
+            self.stderr.write(f'{total} relations updated')
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated author names of {total} relations.'))
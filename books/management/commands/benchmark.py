@@ -0,0 +1,75 @@
+import json
+import subprocess
+from importlib import import_module
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+from books.benchmarks.data import generate_catalogue
+from books.benchmarks.utils import BENCHMARK_CACHES
+
+
+SUITES = ['filters', 'importer', 'api', 'views', 'serializers', 'authors']
+
+
+class Command(BaseCommand):
+    help = 'Runs performance benchmarks against a temporary database ' \
+        'filled with a synthetic catalogue and writes results as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suites', nargs='*', default=SUITES,
+            help=f"Benchmark suites to run ({', '.join(SUITES)}), all by default.")
+        parser.add_argument('--books', type=int, default=100000)
+        parser.add_argument('--authors', type=int, default=30000)
+        parser.add_argument('--languages', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of measured runs of every case.')
+        parser.add_argument(
+            '--output', default='-',
+            help='Results file path, standard output by default.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['suites']) - set(SUITES)
+        if unknown:
+            raise CommandError(f"Unknown suites: {', '.join(sorted(unknown))}")
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                results = {
+                    'commit': self.get_commit(),
+                    'date': timezone.now().isoformat(),
+                    'vendor': connection.vendor,
+                    'data': generate_catalogue(
+                        books=options['books'],
+                        authors=options['authors'],
+                        languages=options['languages'],
+                        seed=options['seed']),
+                    'suites': {},
+                }
+                for suite in options['suites']:
+                    self.stderr.write(f'Running {suite} benchmark...')
+                    module = import_module(f'books.benchmarks.{suite}')
+                    results['suites'][suite] = module.run(repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+
+    def get_commit(self) -> str:
+        """ Returns current git commit hash, if available. """
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True,
+                text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ''
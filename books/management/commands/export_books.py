@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from books.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, iter_books
+
+
+class Command(BaseCommand):
+    help = 'Exports the whole book catalogue as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=list(EXPORT_FORMATS), default='ndjson',
+            help='Output format.')
+        parser.add_argument(
+            '--output', default='-',
+            help='Output file path, standard output by default.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Number of books fetched from the database at once.')
+
+    def handle(self, *args, **options):
+        writer, content_type = EXPORT_FORMATS[options['format']]
+        lines = writer(iter_books(options['chunk_size']))
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+        else:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                f.writelines(lines)
@@ -0,0 +1,66 @@
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand
+
+from books.external_api import BULK_BATCH_SIZE, ExternalApi
+from books.ingest import open_dump, iter_documents, iter_volumes
+
+
+class Command(BaseCommand):
+    help = 'Imports books from local Google Books dumps: result pages ' \
+        'or volumes as concatenated JSON or JSON Lines, optionally gzipped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Dump file paths.')
+        parser.add_argument(
+            '--batch-size', type=int, default=BULK_BATCH_SIZE,
+            help='Number of volumes written in one transaction.')
+        parser.add_argument(
+            '--profile',
+            help='Path of cProfile stats dumped for every dump file, '
+                 'suffixed with its number when there are more files.')
+
+    def handle(self, *args, **options):
+        self.started = time.monotonic()
+        self.read = 0
+        created = 0
+        paths = options['paths']
+        for number, path in enumerate(paths):
+            profile = options['profile']
+            if profile and len(paths) > 1:
+                profile = f'{profile}.{number}'
+            malformed = []
+
+            def on_error(message: str) -> None:
+                malformed.append(message)
+                self.stderr.write(f'{path}: malformed document skipped: {message}')
+
+            with open_dump(path) as f:
+                external_api = ExternalApi(
+                    Path(path).resolve().as_uri(), use_cache=False)
+                volumes = self.count(iter_volumes(
+                    iter_documents(f, on_error=on_error)))
+                result = external_api.import_volumes(
+                    volumes, bulk=True, batch_size=options['batch_size'],
+                    progress=lambda total: self.report(created + total),
+                    profile=profile)
+            result.failed += len(malformed)
+            created += result.created
+            self.stdout.write(f'{path}: {result}')
+        self.report(created)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {created} of {self.read} volumes.'))
+
+    def count(self, volumes):
+        """ Counts volumes read from dumps. """
+        for volume in volumes:
+            self.read += 1
+            yield volume
+
+    def report(self, created: int) -> None:
+        """ Writes progress of the import. """
+        elapsed = time.monotonic() - self.started
+        rate = self.read / elapsed if elapsed else 0
+        self.stderr.write(
+            f'{self.read} volumes read, {created} books created, '
+            f'{rate:.0f} volumes/s')
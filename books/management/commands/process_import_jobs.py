@@ -0,0 +1,72 @@
+import time
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from books.models import ImportJob
+from books.jobs import STALE_JOB_TIMEOUT, run_import_job, requeue_stale_jobs
+
+
+def run_in_thread(job_id: int, profile_dir: Optional[str] = None) -> bool:
+    """ Runs an import job and closes the thread's database connection. """
+    try:
+        return run_import_job(job_id, profile_dir)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Executes queued imports from external API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=2,
+            help='Number of jobs executed at the same time.')
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds between polls for queued jobs.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit when there are no more queued jobs.')
+        parser.add_argument(
+            '--profile-dir',
+            help='Directory for cProfile stats of every job.')
+        parser.add_argument(
+            '--stale-after', type=float, default=STALE_JOB_TIMEOUT,
+            help='Seconds without progress after which a running job '
+                 'is considered abandoned by its worker and queued again.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                for future in [f for f in in_flight if f.done()]:
+                    job_id = in_flight.pop(future)
+                    if future.exception():
+                        self.stderr.write(f"Job {job_id}: {future.exception()}")
+                    else:
+                        job = ImportJob.objects.get(pk=job_id)
+                        self.stdout.write(f"Job {job_id}: {job}")
+                requeued = requeue_stale_jobs(
+                    options['stale_after'], exclude=in_flight.values())
+                if requeued:
+                    self.stderr.write(f"Requeued {requeued} stale job(s)")
+                free = workers - len(in_flight)
+                if free > 0:
+                    job_ids = ImportJob.objects.filter(
+                        status=ImportJob.QUEUED).exclude(
+                        pk__in=in_flight.values()).order_by('pk').values_list(
+                        'pk', flat=True)[:free]
+                    for job_id in job_ids:
+                        in_flight[executor.submit(
+                            run_in_thread, job_id,
+                            options['profile_dir'])] = job_id
+                if in_flight:
+                    wait(in_flight, timeout=options['interval'],
+                         return_when=FIRST_COMPLETED)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['interval'])
@@ -0,0 +1,98 @@
+import logging
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Any, List, Tuple
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_REQUEST_MS = 500
+DEFAULT_TOP_QUERIES = 5
+
+
+class QueryStats:
+    """ Database execute wrapper which counts queries and accumulates
+    their time, per SQL statement. """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Dict[str, List[float]] = {}
+
+    def __call__(self, execute: Callable, sql: str, params: Any,
+                 many: bool, context: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            statement = self.statements.setdefault(sql, [0, 0.0])
+            statement[0] += 1
+            statement[1] += duration
+
+    def get_top_statements(self, limit: int) -> List[Tuple[str, int, float]]:
+        """ Returns SQL statements which took the most time in total,
+        with the number of executions and the total time in milliseconds.
+        Repeated statements (N+1 queries) are grouped together. """
+        statements = sorted(self.statements.items(),
+                            key=lambda item: item[1][1], reverse=True)
+        return [(sql, count, duration * 1000)
+                for sql, (count, duration) in statements[:limit]]
+
+
+class SqlInstrumentationMiddleware:
+    """ Middleware which counts queries and database time of every request,
+    reports them in the Server-Timing header and logs slow requests
+    with their most expensive SQL. Configured with the SQL_INSTRUMENTATION
+    setting and not loaded at all when disabled. """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        options = getattr(settings, 'SQL_INSTRUMENTATION', None)
+        if not options or not options.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request_ms = options.get(
+            'SLOW_REQUEST_MS', DEFAULT_SLOW_REQUEST_MS)
+        self.top_queries = options.get('TOP_QUERIES', DEFAULT_TOP_QUERIES)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.duration * 1000
+        self.add_server_timing(response, stats.count, db_ms, total_ms)
+        if self.slow_request_ms is not None \
+                and total_ms >= self.slow_request_ms:
+            self.log_slow_request(request, stats, db_ms, total_ms)
+        return response
+
+    def add_server_timing(self, response: HttpResponse, count: int,
+                          db_ms: float, total_ms: float) -> None:
+        """ Adds database and total time to the Server-Timing header. """
+        timing = f'db;dur={db_ms:.1f};desc="{count} queries", ' \
+            f'app;dur={total_ms:.1f}'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+    def log_slow_request(self, request: HttpRequest, stats: QueryStats,
+                         db_ms: float, total_ms: float) -> None:
+        """ Logs a slow request with its most expensive SQL statements. """
+        top = '\n'.join(
+            f'  {count}x {duration:.1f} ms: {sql}'
+            for sql, count, duration
+            in stats.get_top_statements(self.top_queries))
+        logger.warning(
+            'Slow request %s %s: %.1f ms, %d queries in %.1f ms\n%s',
+            request.method, request.get_full_path(), total_ms,
+            stats.count, db_ms, top)
@@ -1,4 +1,4 @@
-from typing import Optional, List, Any
+from typing import Optional, List, Dict, Set, Any
 from django.db import models
 from django.core.validators import MaxValueValidator
 from django.db.models.constraints import UniqueConstraint
@@ -27,34 +27,46 @@ class AuthorManager(models.Manager):
 
     def get_or_create_many(self, authors: List[str]) -> List[Any]:
         """ Method which gets or creates (if doesn't exists) author objects
-        from passed authors string list, and returns a list with objects. """
+        from passed authors string list, and returns a list with objects.
+        An author matches an existing one with the same last name and
+        the same first letter of the first name. """
         FIRST_NAME = 0
         SECOND_NAME = 1
         LAST_NAME = -1
         FIRST_LETTER = 0
-        result_list = []
-        for author in authors:
-            author = author.split()
-            count = self.get_queryset().filter(
-                last_name=author[LAST_NAME]).count()
-            if not count:
-                obj = self.create(first_name=author[FIRST_NAME], second_name=' '.join(
-                    author[SECOND_NAME:LAST_NAME]), last_name=author[LAST_NAME])
-                result_list.append(obj)
-            else:
-                count = self.get_queryset().filter(
-                    first_name__startswith=author[FIRST_NAME][FIRST_LETTER],
-                    last_name=author[LAST_NAME]).count()
-                if not count:
-                    obj = self.create(first_name=author[FIRST_NAME], second_name=' '.join(
-                        author[SECOND_NAME:LAST_NAME]), last_name=author[LAST_NAME])
-                    result_list.append(obj)
-                else:
-                    obj = self.get(
-                        first_name__startswith=author[FIRST_NAME][FIRST_LETTER],
-                        last_name=author[LAST_NAME])
-                    result_list.append(obj)
-        return result_list
+        names = [author.split() for author in authors]
+        if not names:
+            return []
+
+        def fetch_candidates(last_names: Set[str]) -> Dict[str, List[Any]]:
+            candidates = {}
+            queryset = self.get_queryset().filter(
+                last_name__in=last_names).order_by('pk')
+            for obj in queryset:
+                candidates.setdefault(obj.last_name, []).append(obj)
+            return candidates
+
+        def match(candidates: Dict[str, List[Any]],
+                  name: List[str]) -> Optional[Any]:
+            for obj in candidates.get(name[LAST_NAME], []):
+                if obj.first_name.startswith(name[FIRST_NAME][FIRST_LETTER]):
+                    return obj
+            return None
+
+        candidates = fetch_candidates({name[LAST_NAME] for name in names})
+        missing = {}
+        for name in names:
+            key = (name[FIRST_NAME][FIRST_LETTER], name[LAST_NAME])
+            if key not in missing and not match(candidates, name):
+                missing[key] = self.model(
+                    first_name=name[FIRST_NAME],
+                    second_name=' '.join(name[SECOND_NAME:LAST_NAME]),
+                    last_name=name[LAST_NAME])
+        if missing:
+            self.bulk_create(missing.values(), ignore_conflicts=True)
+            candidates.update(fetch_candidates(
+                {last_name for first_letter, last_name in missing}))
+        return [match(candidates, name) for name in names]
 
 
 class Author(models.Model):
@@ -119,6 +131,12 @@ class Book(models.Model):
                     'publication_year',
                     'language'],
                 name='unique_book')]
+        indexes = [
+            models.Index(fields=['title', 'id'], name='book_title_id_idx'),
+            models.Index(
+                fields=['language', 'publication_year'],
+                name='book_language_year_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} {self.publication_year}, isbn={self.isbn}, pages: {self.page_count}"
@@ -129,6 +147,56 @@ class Book(models.Model):
 
 
 class BookAuthor(models.Model):
-    """ Model class for storing Author and Book relations. """
+    """ Model class for storing Author and Book relations,
+    with normalised (lowercase) author names used by author filters. """
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    author_first_name = models.CharField(max_length=50, blank=True, default='')
+    author_second_name = models.CharField(max_length=100, blank=True, default='')
+    author_last_name = models.CharField(max_length=50, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['author_last_name', 'book'],
+                name='bookauthor_last_name_idx'),
+            models.Index(
+                fields=['author_first_name', 'book'],
+                name='bookauthor_first_name_idx'),
+        ]
+
+
+class ImportJob(models.Model):
+    """ Model class for storing queued imports from external API. """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    url = models.URLField(max_length=500)
+    crawl = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    report = models.JSONField(blank=True, default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.status}), imported: {self.total}"
+
+    def __repr__(self):
+        return f"<ImportJob(url='{self.url}', status='{self.status}', total={self.total})>"
+
+    @property
+    def is_finished(self) -> bool:
+        """ Returns True when the job is done or failed. """
+        return self.status in (self.DONE, self.FAILED)
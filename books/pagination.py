@@ -0,0 +1,99 @@
+from typing import Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from books.cache import LISTING_CACHE_TIMEOUT
+
+
+COUNT_LIMIT = getattr(settings, 'BOOK_COUNT_LIMIT', 10000)
+
+
+def get_cached_count(queryset: QuerySet, key: str,
+                     limit: Optional[int] = None) -> Tuple[int, bool]:
+    """ Function which returns the number of objects of passed queryset
+    counted up to passed limit, COUNT_LIMIT by default (limit + 1 rows
+    at most are counted) and whether it's exact. Counts are cached under
+    passed key, which should contain the catalogue version
+    and normalised filters. """
+    if limit is None:
+        limit = COUNT_LIMIT
+    counted = cache.get(key)
+    if counted is None:
+        count = queryset.order_by()[:limit + 1].count()
+        counted = (min(count, limit), count <= limit)
+        cache.set(key, counted, LISTING_CACHE_TIMEOUT)
+    return counted
+
+
+class LimitedCountPage(Page):
+    """ Page of LimitedCountPaginator, which beyond an exact count
+    knows only whether there is a next page. """
+    more = False
+
+    def has_next(self) -> bool:
+        if self.paginator.is_exact:
+            return super().has_next()
+        return self.more
+
+    def end_index(self) -> int:
+        if self.paginator.is_exact:
+            return super().end_index()
+        return (self.number - 1) * self.paginator.per_page + len(self)
+
+
+class LimitedCountPaginator(Paginator):
+    """ Paginator which takes the number of objects from get_cached_count.
+    Above the count limit pages are not counted: the number of pages
+    is a lower bound and every page fetches one more row
+    to find out whether a next page exists. """
+
+    def __init__(self, object_list, per_page, count_key: str,
+                 limit: Optional[int] = None, **kwargs) -> None:
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.limit = limit
+
+    @cached_property
+    def counted(self) -> Tuple[int, bool]:
+        return get_cached_count(self.object_list, self.count_key, self.limit)
+
+    @property
+    def count(self) -> int:
+        return self.counted[0]
+
+    @property
+    def is_exact(self) -> bool:
+        return self.counted[1]
+
+    def validate_number(self, number) -> int:
+        """ Validates page number, pages after the counted ones
+        are valid when the count isn't exact. """
+        if self.is_exact:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number) -> Page:
+        if self.is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage('That page contains no results')
+        page = self._get_page(objects[:self.per_page], number, self)
+        page.more = len(objects) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs) -> Page:
+        return LimitedCountPage(*args, **kwargs)
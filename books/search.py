@@ -0,0 +1,43 @@
+import re
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from books.models import Book
+from books.db import SEARCH_TABLE
+
+
+SEARCH_TITLE_WEIGHT = 2.0
+SEARCH_AUTHORS_WEIGHT = 1.0
+
+
+def get_match_query(query: str) -> str:
+    """ Function which converts user input into FTS5 query matching
+    all passed words as prefixes. """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """ Function which filters books by words from title and author names
+    and orders them by relevance (annotated as search_rank, lower first). """
+    match = get_match_query(query)
+    if not match:
+        return queryset
+    if connection.vendor != 'sqlite':
+        lookups = Q()
+        for word in re.findall(r'\w+', query):
+            lookups &= (Q(title__icontains=word) |
+                        Q(authors__last_name__icontains=word))
+        return queryset.filter(lookups).distinct().annotate(
+            search_rank=Value(0.0, output_field=FloatField())).order_by(
+            'search_rank', 'id')
+    matched_ids = RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        [match])
+    rank = RawSQL(
+        f'SELECT bm25({SEARCH_TABLE}, %s, %s) FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = {Book._meta.db_table}.id',
+        [SEARCH_TITLE_WEIGHT, SEARCH_AUTHORS_WEIGHT, match],
+        output_field=FloatField())
+    return queryset.filter(id__in=matched_ids).annotate(
+        search_rank=rank).order_by('search_rank', 'id')
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from books.models import Author, Book, BookAuthor, Language
+from books.languages import language_resolver
+from books.author_search import (
+    update_author_names_on_save,
+    fill_author_names_on_create,
+    fill_author_names_on_add
+)
+from books.cache import (
+    invalidate_catalogue,
+    invalidate_object_version,
+    invalidate_book_authors_version
+)
+
+
+def connect_signals() -> None:
+    """ Connects receivers invalidating cached catalogue data
+    and cached languages, and maintaining author names of relations. """
+    for model in [Author, Book, BookAuthor, Language]:
+        post_save.connect(
+            invalidate_catalogue, sender=model,
+            dispatch_uid=f'invalidate_catalogue_save_{model.__name__}')
+        post_delete.connect(
+            invalidate_catalogue, sender=model,
+            dispatch_uid=f'invalidate_catalogue_delete_{model.__name__}')
+        post_save.connect(
+            invalidate_object_version, sender=model,
+            dispatch_uid=f'invalidate_object_version_save_{model.__name__}')
+        post_delete.connect(
+            invalidate_object_version, sender=model,
+            dispatch_uid=f'invalidate_object_version_delete_{model.__name__}')
+    post_save.connect(
+        language_resolver.invalidate, sender=Language,
+        dispatch_uid='invalidate_language_resolver_save')
+    post_delete.connect(
+        language_resolver.invalidate, sender=Language,
+        dispatch_uid='invalidate_language_resolver_delete')
+    m2m_changed.connect(
+        invalidate_catalogue, sender=Book.authors.through,
+        dispatch_uid='invalidate_catalogue_m2m')
+    m2m_changed.connect(
+        invalidate_book_authors_version, sender=Book.authors.through,
+        dispatch_uid='invalidate_book_authors_version_m2m')
+    post_save.connect(
+        update_author_names_on_save, sender=Author,
+        dispatch_uid='update_author_names_save')
+    post_save.connect(
+        fill_author_names_on_create, sender=BookAuthor,
+        dispatch_uid='fill_author_names_create')
+    m2m_changed.connect(
+        fill_author_names_on_add, sender=Book.authors.through,
+        dispatch_uid='fill_author_names_m2m')
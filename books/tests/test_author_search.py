@@ -0,0 +1,116 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.models import Book, BookAuthor
+from books.filters import BookFilter
+from api.filters import BookFilter as ApiBookFilter
+from books.author_search import filter_by_authors
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class AuthorNamesTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author(
+            first_name='Bolesław', second_name='Maria', last_name='Prus')
+
+    def get_names(self):
+        return list(BookAuthor.objects.values_list(
+            'author_first_name', 'author_second_name', 'author_last_name'))
+
+    def test_names_filled_on_add(self):
+        """ Test names filled when authors are added from both sides. """
+        book = create_sample_book(language=self.language, authors=[self.author])
+        other = create_sample_book(
+            title='Lalka', language=self.language, authors=[])
+        self.author.books.add(other)
+        self.assertEqual(self.get_names(), [('bolesław', 'maria', 'prus')] * 2)
+        book.authors.remove(self.author)
+        self.assertEqual(BookAuthor.objects.count(), 1)
+
+    def test_names_filled_on_create(self):
+        """ Test names filled when a relation is created directly. """
+        book = create_sample_book(language=self.language, authors=[])
+        BookAuthor.objects.create(book=book, author=self.author)
+        self.assertEqual(self.get_names(), [('bolesław', 'maria', 'prus')])
+
+    def test_names_updated_on_author_save(self):
+        """ Test names updated when the author is renamed. """
+        create_sample_book(language=self.language, authors=[self.author])
+        self.author.last_name = 'Głowacki'
+        self.author.save()
+        self.assertEqual(self.get_names(), [('bolesław', 'maria', 'głowacki')])
+
+    def test_backfill_author_names(self):
+        """ Test backfill command stores names of all relations. """
+        book = create_sample_book(language=self.language, authors=[self.author])
+        second = create_sample_author()
+        book.authors.add(second)
+        BookAuthor.objects.update(
+            author_first_name='', author_second_name='', author_last_name='')
+        out = StringIO()
+        call_command('backfill_author_names', chunk_size=1,
+                     stdout=out, stderr=StringIO())
+        self.assertCountEqual(self.get_names(), [
+            ('bolesław', 'maria', 'prus'),
+            ('hans', 'christian', 'andersen')])
+        self.assertIn('Updated author names of 2 relations.', out.getvalue())
+
+
+class AuthorFilterTests(TestCase):
+
+    def setUp(self):
+        language = create_sample_language()
+        self.prus = create_sample_author(
+            first_name='Bolesław', second_name='Maria', last_name='Prus')
+        self.andersen = create_sample_author()
+        self.lalka = create_sample_book(
+            title='Lalka', language=language, authors=[self.prus])
+        self.both = create_sample_book(
+            title='Antologia', language=language,
+            authors=[self.prus, self.andersen])
+
+    def test_filter_by_authors(self):
+        """ Test case-insensitive author filters without duplicates. """
+        queryset = filter_by_authors(
+            Book.objects.all(), {'authors__last_name': 'PRUS'})
+        self.assertCountEqual(queryset, [self.lalka, self.both])
+        queryset = filter_by_authors(
+            Book.objects.all(), {'authors__second_name': 'christ'})
+        self.assertCountEqual(queryset, [self.both])
+        queryset = filter_by_authors(
+            Book.objects.all(), {'authors__first_name': 'BOLESŁAW',
+                                 'authors__second_name': ''})
+        self.assertCountEqual(queryset, [self.lalka, self.both])
+
+    def test_filters_match_same_author(self):
+        """ Test combined author filters match one author of the book. """
+        for filterset_class in [BookFilter, ApiBookFilter]:
+            queryset = filterset_class(
+                {'authors__first_name': 'hans', 'authors__last_name': 'prus'},
+                queryset=Book.objects.all()).qs
+            self.assertFalse(queryset.exists())
+            queryset = filterset_class(
+                {'authors__first_name': 'bolesław',
+                 'authors__last_name': 'prus'},
+                queryset=Book.objects.all()).qs
+            self.assertCountEqual(queryset, [self.lalka, self.both])
+
+    def test_filters_single_subquery(self):
+        """ Test author filters are one subquery over relations,
+        without joining authors or DISTINCT. """
+        for filterset_class in [BookFilter, ApiBookFilter]:
+            queryset = filterset_class(
+                {'authors__first_name': 'hans',
+                 'authors__last_name': 'andersen',
+                 'title__icontains' if filterset_class is BookFilter
+                 else 'title__contains': 'anto'},
+                queryset=Book.objects.all()).qs
+            self.assertEqual(list(queryset), [self.both])
+            sql = str(queryset.query)
+            self.assertEqual(sql.count('IN (SELECT'), 1)
+            self.assertNotIn('DISTINCT', sql)
+            self.assertNotIn('books_author"', sql)
+            self.assertIn('bookauthor_', queryset.explain())
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from books.models import Book
+from books.languages import language_resolver
+from books.benchmarks.data import generate_volumes
+from books.benchmarks.importer import import_volumes
+from books.benchmarks.utils import measure_requests
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class BenchmarkTests(TestCase):
+
+    def setUp(self):
+        language_resolver.invalidate()
+
+    def test_import_volumes_rolled_back(self):
+        """ Test crawling the fake feed imports all volumes
+        and leaves the database unchanged. """
+        volumes = generate_volumes(100, languages=3)
+        self.assertEqual(import_volumes(volumes, bulk=True).created, 100)
+        self.assertEqual(
+            import_volumes(volumes[:10], bulk=False).created, 10)
+        self.assertFalse(Book.objects.exists())
+
+    def test_measure_requests(self):
+        """ Test measuring requests with and without the response cache. """
+        create_sample_book(language=create_sample_language(),
+                           authors=[create_sample_author()])
+        results = measure_requests(
+            reverse('book-list'), [('all', {})], repeat=1)
+        self.assertGreater(results['all']['uncached']['queries'], 0)
+        self.assertEqual(results['all']['cached']['queries'], 0)
+
+    def test_measure_requests_keeps_default_cache(self):
+        """ Test measuring requests doesn't clear the default cache. """
+        cache.set('books:benchmark-test', 1)
+        measure_requests(reverse('book-list'), [('all', {})], repeat=1)
+        self.assertEqual(cache.get('books:benchmark-test'), 1)
+
+    def test_measure_requests_error(self):
+        """ Test measuring requests fails on unsuccessful responses. """
+        with self.assertRaises(RuntimeError):
+            measure_requests(
+                reverse('book-list'), [('invalid', {'fields': 'x'})],
+                repeat=1)
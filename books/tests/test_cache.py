@@ -0,0 +1,265 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.urls import reverse
+from django.test import TestCase
+
+from books.models import Book
+from books.filters import BookFilter
+from books.cache import (
+    get_catalogue_version,
+    bump_catalogue_version,
+    get_listing_cache_key,
+    get_book_row_versions
+)
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class CatalogueVersionTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+
+    def assertVersionBumped(self, func):
+        """ Asserts passed function changes the catalogue version. """
+        version = get_catalogue_version()
+        func()
+        self.assertGreater(get_catalogue_version(), version)
+
+    def test_version_bumped_on_writes(self):
+        """ Test catalogue version changes on model writes. """
+        book = create_sample_book(
+            language=self.language, authors=[self.author])
+        self.assertVersionBumped(lambda: create_sample_language(
+            language='English', shortcut='en'))
+        self.assertVersionBumped(self.author.save)
+        self.assertVersionBumped(lambda: book.authors.clear())
+        self.assertVersionBumped(book.delete)
+
+    def test_version_after_eviction(self):
+        """ Test catalogue version does not go back after eviction. """
+        version = get_catalogue_version()
+        cache.clear()
+        self.assertGreaterEqual(get_catalogue_version(), version)
+
+
+class ListingCacheKeyTests(TestCase):
+
+    def test_normalised_parameters(self):
+        """ Test cache key does not depend on parameter order,
+        empty values and unknown parameters. """
+        key = get_listing_cache_key(
+            'html', QueryDict('title__iexact=Hobbit&publication_year_min=2000'),
+            BookFilter, version=1)
+        same_key = get_listing_cache_key(
+            'html', QueryDict(
+                'publication_year_min=2000&language=&utm=1&title__iexact=Hobbit'),
+            BookFilter, version=1)
+        self.assertEqual(key, same_key)
+
+    def test_different_parameters(self):
+        """ Test cache key depends on filter values and extra parameters. """
+        key = get_listing_cache_key(
+            'api', QueryDict('title__iexact=Hobbit'), BookFilter,
+            extra=['cursor'], version=1)
+        other_keys = [
+            get_listing_cache_key(
+                'api', QueryDict('title__iexact=hobbit'), BookFilter,
+                extra=['cursor'], version=1),
+            get_listing_cache_key(
+                'api', QueryDict('title__iexact=Hobbit&cursor=abc'),
+                BookFilter, extra=['cursor'], version=1),
+            get_listing_cache_key(
+                'api', QueryDict('title__iexact=Hobbit'), BookFilter,
+                extra=['cursor'], version=2),
+        ]
+        self.assertNotIn(key, other_keys)
+
+    def test_repeated_parameters(self):
+        """ Test cache key depends on the last value of repeated
+        parameters, the one used for filtering. """
+        key = get_listing_cache_key(
+            'html', QueryDict('title__iexact=Book 2&title__iexact=Book 1'),
+            BookFilter, version=1)
+        other_key = get_listing_cache_key(
+            'html', QueryDict('title__iexact=Book 1&title__iexact=Book 2'),
+            BookFilter, version=1)
+        self.assertNotEqual(key, other_key)
+        self.assertEqual(key, get_listing_cache_key(
+            'html', QueryDict('title__iexact=Book 1'), BookFilter, version=1))
+        self.assertNotEqual(
+            get_listing_cache_key(
+                'html', QueryDict('title__iexact=a,b'), BookFilter, version=1),
+            get_listing_cache_key(
+                'html', QueryDict('title__iexact=a&title__iexact=b'),
+                BookFilter, version=1))
+
+
+class ListingCacheViewTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+        self.book = create_sample_book(
+            language=self.language, authors=[self.author])
+
+    def test_book_list_cached(self):
+        """ Test book list page served from cache until a book changes. """
+        url = reverse('books:book-list')
+        self.client.get(url, {'title__icontains': 'kaczątko'})
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'title__icontains': 'kaczątko'})
+        self.assertContains(response, 'Brzydkie kaczątko')
+        self.book.title = 'Brzydkie kaczątko i inne baśnie'
+        self.book.save()
+        response = self.client.get(url, {'title__icontains': 'kaczątko'})
+        self.assertContains(response, 'inne baśnie')
+
+    def test_book_list_repeated_parameters(self):
+        """ Test book list cached separately for repeated filter values
+        in different order. """
+        create_sample_book(
+            title='Potop', language=self.language, authors=[self.author])
+        url = reverse('books:book-list')
+        response = self.client.get(
+            url + '?title__iexact=Potop&title__iexact=Brzydkie kaczątko')
+        self.assertContains(response, 'Brzydkie kaczątko')
+        self.assertNotContains(response, 'Potop')
+        response = self.client.get(
+            url + '?title__iexact=Brzydkie kaczątko&title__iexact=Potop')
+        self.assertContains(response, 'Potop')
+        self.assertNotContains(response, 'Brzydkie kaczątko')
+
+    def test_books_api_cached(self):
+        """ Test books API served from cache until an author changes. """
+        url = reverse('book-list')
+        self.client.get(url, {'language__shortcut': 'pl'})
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'language__shortcut': 'pl'})
+        self.assertEqual(len(response.json()['results']), 1)
+        self.author.second_name = 'Ch.'
+        self.author.save()
+        response = self.client.get(url, {'language__shortcut': 'pl'})
+        author = response.json()['results'][0]['authors'][0]
+        self.assertEqual(author['second_name'], 'Ch.')
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+        self.book = create_sample_book(
+            language=self.language, authors=[self.author])
+
+    def assertNotModifiedUntilChange(self, url):
+        """ Asserts passed URL returns 304 for its ETag without
+        running queries until the catalogue changes. """
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.book.title = 'Królowa śniegu'
+        self.book.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_book_list_etag(self):
+        """ Test conditional GET of book list page. """
+        self.assertNotModifiedUntilChange(reverse('books:book-list'))
+
+    def test_books_api_etag(self):
+        """ Test conditional GET of books API. """
+        self.assertNotModifiedUntilChange(reverse('book-list'))
+
+    def test_books_api_etag_depends_on_query(self):
+        """ Test ETag differs between filtered listings. """
+        url = reverse('book-list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(
+            url, {'language__shortcut': 'en'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_books_api_ignores_if_modified_since(self):
+        """ Test books API revalidates with ETag only, because
+        HTTP dates can't tell apart changes made in the same second. """
+        url = reverse('book-list')
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        create_sample_book(
+            title='Potop', language=self.language, authors=[self.author])
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+
+class BookRowVersionTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+        self.book = create_sample_book(
+            language=self.language, authors=[self.author])
+        self.other_book = create_sample_book(
+            title='Potop', language=self.language, authors=[])
+
+    def get_versions(self):
+        """ Returns row versions of sample books. """
+        books = Book.objects.prefetch_related('authors').order_by('id')
+        return get_book_row_versions(list(books))
+
+    def assertRowChanged(self, func, changed, unchanged=()):
+        """ Asserts passed function changes only rows of passed books. """
+        versions = self.get_versions()
+        func()
+        new_versions = self.get_versions()
+        for book in changed:
+            self.assertNotEqual(versions[book.pk], new_versions[book.pk])
+        for book in unchanged:
+            self.assertEqual(versions[book.pk], new_versions[book.pk])
+
+    def test_versions_stable(self):
+        """ Test row versions don't change without writes. """
+        self.assertEqual(self.get_versions(), self.get_versions())
+
+    def test_book_change(self):
+        """ Test row version changes with the book. """
+        self.book.page_count = 40
+        self.assertRowChanged(
+            self.book.save, [self.book], [self.other_book])
+
+    def test_author_change(self):
+        """ Test row version changes with author of the book. """
+        self.author.second_name = 'Ch.'
+        self.assertRowChanged(
+            self.author.save, [self.book], [self.other_book])
+
+    def test_book_authors_change(self):
+        """ Test row version changes with authors of the book. """
+        self.assertRowChanged(
+            lambda: self.author.books.add(self.other_book),
+            [self.other_book], [])
+        self.assertRowChanged(
+            lambda: self.author.books.clear(),
+            [self.book, self.other_book])
+
+    def test_language_change(self):
+        """ Test row version changes with language of the book. """
+        self.language.language = 'Polski'
+        self.assertRowChanged(
+            self.language.save, [self.book, self.other_book])
+
+    def test_book_list_reuses_rows(self):
+        """ Test book list page renders unchanged rows from cache. """
+        url = reverse('books:book-list')
+        self.client.get(url)
+        Book.objects.filter(pk=self.book.pk).update(title='Nowy tytuł')
+        bump_catalogue_version()
+        response = self.client.get(url)
+        self.assertContains(response, 'Brzydkie kaczątko')
+        self.book.refresh_from_db()
+        self.book.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Nowy tytuł')
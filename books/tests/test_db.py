@@ -0,0 +1,37 @@
+from django.db import connection
+from django.test import TestCase
+
+from books.models import Author, Book
+from books.filters import BookFilter
+from books.db import CASE_INSENSITIVE_INDEXES
+from books.tests.test_models import create_sample_language
+
+
+class CaseInsensitiveIndexTests(TestCase):
+
+    def test_indexes_created_on_migrate(self):
+        """ Test case insensitive indexes are created after migrations. """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")
+            indexes = {row[0] for row in cursor.fetchall()}
+        for name, model, column in CASE_INSENSITIVE_INDEXES:
+            self.assertIn(name, indexes)
+
+    def test_iexact_lookup_uses_index(self):
+        """ Test iexact filters are executed as index searches. """
+        queryset = Author.objects.filter(last_name__iexact='andersen')
+        self.assertIn('books_author_last_name_ci', queryset.explain())
+        queryset = Book.objects.filter(title__iexact='hobbit')
+        self.assertIn('books_book_title_ci', queryset.explain())
+
+    def test_year_range_language_uses_index(self):
+        """ Test year range with language filter uses composite index. """
+        language = create_sample_language()
+        params = {
+            'publication_year_min': '1990',
+            'publication_year_max': '2000',
+            'language': str(language.pk),
+        }
+        queryset = BookFilter(params, queryset=Book.objects.all()).qs
+        self.assertIn('book_language_year_idx', queryset.explain())
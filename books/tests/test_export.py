@@ -0,0 +1,59 @@
+import csv
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.export import iter_books, iter_ndjson, iter_csv
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.authors = [
+            create_sample_author(),
+            create_sample_author(
+                first_name='Henryk', second_name='', last_name='Sienkiewicz'),
+        ]
+        for i in range(5):
+            create_sample_book(
+                title=f'Book {i}',
+                language=self.language,
+                authors=self.authors)
+
+    def test_iter_books_chunks(self):
+        """ Test walking the catalogue in chunks with constant
+        number of queries per chunk. """
+        with self.assertNumQueries(7):
+            books = list(iter_books(chunk_size=2))
+        self.assertEqual([book['title'] for book in books],
+                         [f'Book {i}' for i in range(5)])
+        self.assertEqual(books[0]['language'], 'pl')
+        self.assertEqual(books[0]['authors'][1]['last_name'], 'Sienkiewicz')
+
+    def test_iter_ndjson(self):
+        """ Test writing books as NDJSON lines. """
+        lines = list(iter_ndjson(iter_books()))
+        book = json.loads(lines[0])
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(book['title'], 'Book 0')
+        self.assertEqual(book['isbn'], 9788372783301)
+
+    def test_iter_csv(self):
+        """ Test writing books as CSV lines. """
+        rows = list(csv.reader(iter_csv(iter_books())))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0][:2], ['title', 'authors'])
+        self.assertEqual(
+            rows[1][:2],
+            ['Book 0', 'Hans Christian Andersen; Henryk Sienkiewicz'])
+
+    def test_export_books_command(self):
+        """ Test export books management command. """
+        out = StringIO()
+        call_command('export_books', format='ndjson', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[4])['title'], 'Book 4')
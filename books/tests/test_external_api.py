@@ -1,8 +1,15 @@
+import os
+import pstats
+import tempfile
 import unittest
-from unittest.mock import patch
+from typing import Optional, List, Dict, Any
+from unittest.mock import patch, MagicMock
+from urllib.parse import urlparse, parse_qs
+from django.test import TestCase
 
-from books.external_api import ExternalApi
-from books.models import Book
+from books.external_api import ExternalApi, STAGES
+from books.languages import language_resolver
+from books.models import Author, Book
 from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
 
 
@@ -10,9 +17,10 @@ class TestExternalApi(unittest.TestCase):
 
     def setUp(self):
         url = "https://www.googleapis.com/books/v1/volumes?q=Hobbit"
-        self.external_api = ExternalApi(url)
+        self.external_api = ExternalApi(url, use_cache=False)
+        language_resolver.invalidate()
 
-    @patch('books.external_api.requests.get')
+    @patch('books.external_api.requests.Session.get')
     def test_fetch_data_valid_request(self, mock_requests_get):
         """ Test fetch_data method when valid request. """
         example_data = {
@@ -25,7 +33,7 @@ class TestExternalApi(unittest.TestCase):
         self.assertEqual(data, example_data)
         self.assertEqual(error, '')
 
-    @patch('books.external_api.requests.get')
+    @patch('books.external_api.requests.Session.get')
     def test_fetch_data_invalid_request(self, mock_requests_get):
         """ Test fetch_data method when bad request. """
         mock_requests_get.return_value.status_code = 404
@@ -33,6 +41,59 @@ class TestExternalApi(unittest.TestCase):
         data, error = self.external_api._fetch_data()
         self.assertEqual(data, {})
         self.assertEqual(error, 'Not found')
+        self.assertEqual(self.external_api.result.errors,
+                         [f"{self.external_api.url}: Not found"])
+
+    def test_get_page_url(self):
+        """ Test building result page URL from passed start index. """
+        url = self.external_api._get_page_url(80)
+        self.assertEqual(
+            url,
+            "https://www.googleapis.com/books/v1/volumes"
+            "?q=Hobbit&startIndex=80&maxResults=40")
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_iter_pages(self, mocked_fetch_data):
+        """ Test following result pages until totalItems is exhausted. """
+        pages = {
+            0: {'totalItems': 100, 'items': [{'id': 1}]},
+            40: {'totalItems': 100, 'items': [{'id': 2}]},
+            80: {'totalItems': 100, 'items': [{'id': 3}]},
+        }
+        mocked_fetch_data.side_effect = lambda index: (pages[index], '')
+        fetched = list(self.external_api._iter_pages())
+        self.assertEqual(fetched, list(pages.values()))
+        self.assertCountEqual(
+            [call.args for call in mocked_fetch_data.call_args_list],
+            [(0,), (40,), (80,)])
+
+    def test_iter_pages_concurrent_session(self):
+        """ Test crawling fetches pages with the shared session. """
+        url = "https://www.googleapis.com/books/v1/volumes?q=Hobbit&maxResults=2"
+        session = MagicMock()
+        session.get.return_value.status_code = 200
+        session.get.return_value.json.return_value = {
+            'totalItems': 6, 'items': [{'id': 1}, {'id': 2}]}
+        external_api = ExternalApi(
+            url, concurrency=2, session=session, use_cache=False)
+        fetched = list(external_api._iter_pages())
+        self.assertEqual(len(fetched), 3)
+        self.assertCountEqual(
+            [parse_qs(urlparse(call.args[0]).query)['startIndex']
+             for call in session.get.call_args_list],
+            [['0'], ['2'], ['4']])
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_iter_pages_empty_page(self, mocked_fetch_data):
+        """ Test crawling stops at a page without items. """
+        pages = {
+            0: {'totalItems': 200, 'items': [{'id': 1}]},
+            40: {'totalItems': 200},
+        }
+        mocked_fetch_data.side_effect = lambda index: (
+            pages.get(index, {'totalItems': 200, 'items': [{'id': 2}]}), '')
+        fetched = list(self.external_api._iter_pages())
+        self.assertEqual(len(fetched), 1)
 
     def test_get_title(self):
         """ Test getting title without subtitle from json data. """
@@ -223,7 +284,183 @@ class TestExternalApi(unittest.TestCase):
             ]
         }
         mocked_fetch_data.return_value = (data, '')
-        total = self.external_api.import_books()
+        result = self.external_api.import_books()
         exists = Book.objects.filter(title='Dziady').exists()
-        self.assertEqual(total, 1)
+        self.assertEqual(result.created, 1)
         self.assertTrue(exists)
+
+
+def create_sample_volume(title: str = 'Dziady',
+                         authors: Optional[List[str]] = None,
+                         published_date: str = '2008',
+                         language: str = 'pl') -> Dict[str, Any]:
+    """ Creating sample Google Books volume data. """
+    return {
+        'volumeInfo': {
+            'title': title,
+            'authors': authors or ['Adam Mickiewicz'],
+            'pageCount': 300,
+            'publishedDate': published_date,
+            'language': language,
+            'imageLinks': {
+                'thumbnail': 'https://cover_link.com'
+            },
+            'industryIdentifiers': [
+                {
+                    'type': 'ISBN_13',
+                    'identifier': '9788372783301'
+                },
+            ],
+        }
+    }
+
+
+class TestExternalApiBulkImport(TestCase):
+
+    def setUp(self):
+        url = "https://www.googleapis.com/books/v1/volumes?q=Mickiewicz"
+        self.external_api = ExternalApi(url, use_cache=False)
+        language_resolver.invalidate()
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_bulk(self, mocked_fetch_data):
+        """ Test bulk import of new books with their authors. """
+        data = {
+            'items': [
+                create_sample_volume(
+                    title='Dziady', authors=[
+                        'Adam Mickiewicz', 'Juliusz Słowacki']),
+                create_sample_volume(title='Pan Tadeusz'),
+                create_sample_volume(title='Konrad Wallenrod', language='en'),
+            ]
+        }
+        mocked_fetch_data.return_value = (data, '')
+        result = self.external_api.import_books(bulk=True, batch_size=2)
+        book = Book.objects.get(title='Dziady')
+        self.assertEqual(result.created, 3)
+        self.assertEqual(Book.objects.count(), 3)
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(
+            [author.last_name for author in book.authors.all()],
+            ['Mickiewicz', 'Słowacki'])
+        self.assertEqual(book.isbn, 9788372783301)
+        self.assertEqual(book.language.shortcut, 'pl')
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_bulk_skips_existing(self, mocked_fetch_data):
+        """ Test bulk import skips books which already exist
+        and duplicated volumes within a batch. """
+        language = create_sample_language()
+        author = create_sample_author(
+            first_name='Adam',
+            second_name='',
+            last_name='Mickiewicz'
+        )
+        create_sample_book(
+            title='Pan Tadeusz',
+            language=language,
+            authors=[author]
+        )
+        data = {
+            'items': [
+                create_sample_volume(title='Pan Tadeusz'),
+                create_sample_volume(title='Dziady'),
+                create_sample_volume(title='Dziady'),
+            ]
+        }
+        mocked_fetch_data.return_value = (data, '')
+        result = self.external_api.import_books(bulk=True)
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(Author.objects.count(), 1)
+        self.assertEqual(author.books.count(), 2)
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_crawl(self, mocked_fetch_data):
+        """ Test importing all result pages in crawl mode. """
+        pages = {
+            0: {'totalItems': 43, 'items': [
+                create_sample_volume(title='Dziady'),
+                create_sample_volume(title='Pan Tadeusz')]},
+            40: {'totalItems': 43, 'items': [
+                create_sample_volume(title='Konrad Wallenrod')]},
+        }
+        mocked_fetch_data.side_effect = lambda index: (pages[index], '')
+        result = self.external_api.import_books(bulk=True, crawl=True)
+        self.assertEqual(result.created, 3)
+        self.assertEqual(Book.objects.count(), 3)
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_result(self, mocked_fetch_data):
+        """ Test import result counts failed volumes and stage timings. """
+        broken = create_sample_volume(title='Broken', published_date='unknown')
+        untitled = create_sample_volume()
+        del untitled['volumeInfo']['title']
+        data = {'items': [create_sample_volume(), broken, untitled]}
+        mocked_fetch_data.return_value = (data, '')
+        for bulk in (True, False):
+            Book.objects.all().delete()
+            result = self.external_api.import_books(bulk=bulk)
+            self.assertEqual(
+                (result.created, result.skipped, result.failed), (1, 0, 2))
+            self.assertEqual(list(result.timings), list(STAGES))
+            self.assertGreater(result.timings['insert'], 0)
+            self.assertGreater(result.elapsed, 0)
+            self.assertEqual(result.as_dict()['failed'], 2)
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_without_publication_year(self, mocked_fetch_data):
+        """ Test volumes without publication year counted as failed. """
+        undated = create_sample_volume(title='Undated')
+        del undated['volumeInfo']['publishedDate']
+        data = {'items': [create_sample_volume(), undated]}
+        mocked_fetch_data.return_value = (data, '')
+        for bulk in (True, False):
+            Book.objects.all().delete()
+            result = self.external_api.import_books(bulk=bulk)
+            self.assertEqual((result.created, result.failed), (1, 1))
+            self.assertEqual(Book.objects.count(), 1)
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_invalid_language_and_authors(self, mocked_fetch_data):
+        """ Test volumes without language or with empty author names
+        counted as failed. """
+        without_language = create_sample_volume(title='Without language')
+        del without_language['volumeInfo']['language']
+        empty_author = create_sample_volume(
+            title='Empty author', authors=['Adam Mickiewicz', ' '])
+        single_author = create_sample_volume(
+            title='Single author', authors='Adam Mickiewicz')
+        data = {'items': [create_sample_volume(), without_language,
+                          empty_author, single_author]}
+        mocked_fetch_data.return_value = (data, '')
+        for bulk in (True, False):
+            Book.objects.all().delete()
+            result = self.external_api.import_books(bulk=bulk)
+            self.assertEqual((result.created, result.failed), (1, 3))
+            self.assertEqual(Book.objects.count(), 1)
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_without_authors(self, mocked_fetch_data):
+        """ Test volumes without authors imported in both modes. """
+        without_authors = create_sample_volume(title='Without authors')
+        del without_authors['volumeInfo']['authors']
+        mocked_fetch_data.return_value = ({'items': [without_authors]}, '')
+        for bulk in (True, False):
+            Book.objects.all().delete()
+            result = self.external_api.import_books(bulk=bulk)
+            self.assertEqual((result.created, result.failed), (1, 0))
+            self.assertFalse(Book.objects.get().authors.exists())
+
+    @patch.object(ExternalApi, '_fetch_data')
+    def test_import_books_profile(self, mocked_fetch_data):
+        """ Test dumping cProfile stats of the import. """
+        mocked_fetch_data.return_value = (
+            {'items': [create_sample_volume()]}, '')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'import.prof')
+            self.external_api.import_books(bulk=True, profile=path)
+            stats = pstats.Stats(path)
+        self.assertTrue(any(function == '_bulk_create_book_objs'
+                            for filename, line, function in stats.stats))
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from books.external_api import ExternalApi
+from books.http_cache import ResponseCache
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """ Request handler of stub Google Books server. """
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(server.data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', server.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ResponseCacheStubServerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.requests = []
+        self.server.etag = '"v1"'
+        self.server.data = {'totalItems': 1, 'items': [{'id': 'a'}]}
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/volumes?q=Hobbit'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.directory.cleanup()
+
+    def create_external_api(self, ttl: int = 60,
+                            use_cache: bool = True) -> ExternalApi:
+        """ Creating ExternalApi with a response cache in temporary directory. """
+        external_api = ExternalApi(self.url, use_cache=use_cache)
+        if use_cache:
+            external_api.cache = ResponseCache(self.directory.name, ttl=ttl)
+        return external_api
+
+    def test_fresh_response_from_cache(self):
+        """ Test repeated fetch served from cache without request. """
+        external_api = self.create_external_api()
+        first, error = external_api._fetch_data()
+        second, error = self.create_external_api()._fetch_data()
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_response_revalidated(self):
+        """ Test stale response revalidated with If-None-Match. """
+        self.create_external_api(ttl=0)._fetch_data()
+        data, error = self.create_external_api(ttl=0)._fetch_data()
+        self.assertEqual(data, self.server.data)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1]['If-None-Match'], '"v1"')
+
+    def test_changed_response_replaced(self):
+        """ Test stale response replaced when resource changed. """
+        self.create_external_api(ttl=0)._fetch_data()
+        self.server.etag = '"v2"'
+        self.server.data = {'totalItems': 0}
+        data, error = self.create_external_api(ttl=0)._fetch_data()
+        self.assertEqual(data, {'totalItems': 0})
+        cache = ResponseCache(self.directory.name)
+        self.assertEqual(cache.get(self.url)['etag'], '"v2"')
+
+    def test_bypass_cache(self):
+        """ Test fetching without cache. """
+        self.create_external_api()._fetch_data()
+        external_api = self.create_external_api(use_cache=False)
+        external_api._fetch_data()
+        self.assertIsNone(external_api.cache)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+class ResponseCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_evict_least_recently_used(self):
+        """ Test least recently used entries evicted above maximum size. """
+        cache = ResponseCache(self.directory.name, max_size=10**6)
+        data = {'items': ['x' * 1000]}
+        for i in range(3):
+            cache.set(f'https://example.com/{i}', data)
+            past = time.time() - 100 + i
+            os.utime(cache._get_path(f'https://example.com/{i}'), (past, past))
+        cache.get('https://example.com/0')
+        cache.max_size = sum(
+            cache._get_path(f'https://example.com/{i}').stat().st_size
+            for i in [0, 2])
+        cache.evict()
+        self.assertIsNotNone(cache.get('https://example.com/0'))
+        self.assertIsNone(cache.get('https://example.com/1'))
+        self.assertIsNotNone(cache.get('https://example.com/2'))
+
+    def test_evict_when_over_maximum_size(self):
+        """ Test the directory scanned on the first write, then only
+        when written entries exceed maximum size. """
+        cache = ResponseCache(self.directory.name, max_size=10**6)
+        data = {'items': ['x' * 1000]}
+        with mock.patch.object(cache, 'evict', wraps=cache.evict) as evict:
+            for i in range(3):
+                cache.set(f'https://example.com/{i}', data)
+            self.assertEqual(evict.call_count, 1)
+            cache.max_size = 1
+            cache.set('https://example.com/3', data)
+            self.assertEqual(evict.call_count, 2)
+        self.assertEqual(list(Path(self.directory.name).iterdir()), [])
+
+    def test_evict_every_interval(self):
+        """ Test the directory scanned every evict_interval writes. """
+        cache = ResponseCache(self.directory.name, evict_interval=2)
+        with mock.patch.object(cache, 'evict', wraps=cache.evict) as evict:
+            for i in range(5):
+                cache.set(f'https://example.com/{i}', {})
+        self.assertEqual(evict.call_count, 3)
+
+    def test_get_missing(self):
+        """ Test getting entry of URL which was not cached. """
+        cache = ResponseCache(self.directory.name)
+        self.assertIsNone(cache.get('https://example.com/'))
@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.models import Book
+from books.ingest import iter_documents, iter_volumes
+from books.languages import language_resolver
+from books.tests.test_external_api import create_sample_volume
+
+
+class IterDocumentsTests(TestCase):
+
+    def test_concatenated_documents(self):
+        """ Test parsing concatenated JSON documents read in small chunks. """
+        documents = [{'items': [create_sample_volume(title=f'Book {i}')]}
+                     for i in range(5)]
+        content = ''.join(json.dumps(document, indent=2)
+                          for document in documents)
+        parsed = list(iter_documents(StringIO(content), chunk_size=7))
+        self.assertEqual(parsed, documents)
+
+    def test_json_lines(self):
+        """ Test parsing JSON Lines. """
+        content = '{"id": 1}\n{"id": 2}\n\n'
+        parsed = list(iter_documents(StringIO(content), chunk_size=4))
+        self.assertEqual(parsed, [{'id': 1}, {'id': 2}])
+
+    def test_truncated_document(self):
+        """ Test error raised for truncated document at end of file. """
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_documents(StringIO('{"id": 1}{"id": ')))
+
+    def test_malformed_document(self):
+        """ Test malformed documents skipped without reading
+        the rest of the file. """
+        lines = ['{"id": 1}', '{"id": 2,, "x": 3}', '{"id": 3}']
+        lines += ['{"id": %d}' % i for i in range(4, 1000)]
+        file = StringIO('\n'.join(lines))
+        errors = []
+        documents = iter_documents(file, chunk_size=16, on_error=errors.append)
+        self.assertEqual([next(documents) for i in range(2)],
+                         [{'id': 1}, {'id': 3}])
+        self.assertEqual(len(errors), 1)
+        self.assertLess(file.tell(), 100)
+        self.assertEqual(len(list(documents)), 996)
+
+    def test_truncated_document_skipped(self):
+        """ Test truncated document at end of file reported
+        to the error callback. """
+        errors = []
+        documents = list(iter_documents(
+            StringIO('{"id": 1}{"id": '), on_error=errors.append))
+        self.assertEqual(documents, [{'id': 1}])
+        self.assertEqual(errors, ['Expecting value'])
+
+    def test_iter_volumes(self):
+        """ Test extracting book data from pages, volumes and volumeInfo. """
+        volume = create_sample_volume()
+        documents = [{'totalItems': 1, 'items': [volume]}, volume,
+                     volume['volumeInfo'], {'totalItems': 0}]
+        volumes = list(iter_volumes(iter(documents)))
+        self.assertEqual(volumes, [volume['volumeInfo']] * 3)
+
+
+class IngestBooksCommandTests(TestCase):
+
+    def setUp(self):
+        language_resolver.invalidate()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ingest_books(self):
+        """ Test importing books from JSON Lines and gzipped pages. """
+        jsonl_path = os.path.join(self.directory.name, 'volumes.jsonl')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for i in range(3):
+                f.write(json.dumps(create_sample_volume(title=f'Book {i}')) + '\n')
+        pages_path = os.path.join(self.directory.name, 'pages.json.gz')
+        with gzip.open(pages_path, 'wt', encoding='utf-8') as f:
+            for i in range(2, 6):
+                f.write(json.dumps({'items': [
+                    create_sample_volume(title=f'Book {i}')]}))
+        out = StringIO()
+        call_command('ingest_books', jsonl_path, pages_path, batch_size=2,
+                     stdout=out, stderr=StringIO())
+        self.assertEqual(Book.objects.count(), 6)
+        self.assertIn('Imported 6 of 7 volumes.', out.getvalue())
+
+    def test_ingest_books_malformed(self):
+        """ Test malformed lines counted as failed and skipped. """
+        path = os.path.join(self.directory.name, 'volumes.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(create_sample_volume(title='Book 1')) + '\n')
+            f.write('{"volumeInfo": {"title": "Broken"\n')
+            f.write(json.dumps(create_sample_volume(title='Book 2')) + '\n')
+        out = StringIO()
+        err = StringIO()
+        call_command('ingest_books', path, stdout=out, stderr=err)
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertIn('failed: 1', out.getvalue())
+        self.assertIn('malformed document skipped', err.getvalue())
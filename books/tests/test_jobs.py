@@ -0,0 +1,152 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from books.models import ImportJob
+from books.external_api import ExternalApi, ImportResult
+from books.jobs import run_import_job, requeue_stale_jobs
+
+
+def create_sample_job(
+        url: str = 'https://www.googleapis.com/books/v1/volumes?q=Hobbit',
+        crawl: bool = False) -> ImportJob:
+    """ Creating sample ImportJob object. """
+    return ImportJob.objects.create(url=url, crawl=crawl)
+
+
+def create_sample_result(created: int = 12, skipped: int = 0) -> ImportResult:
+    """ Creating sample ImportResult object. """
+    result = ImportResult()
+    result.created = created
+    result.skipped = skipped
+    return result
+
+
+class RunImportJobTests(TestCase):
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_run_import_job(self, mocked_import_books):
+        """ Test running queued import job. """
+        mocked_import_books.return_value = create_sample_result(
+            created=12, skipped=3)
+        job = create_sample_job(crawl=True)
+        run = run_import_job(job.pk)
+        job.refresh_from_db()
+        self.assertTrue(run)
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertEqual(job.total, 12)
+        self.assertEqual(job.report['skipped'], 3)
+        self.assertIsNotNone(job.finished_at)
+        self.assertTrue(mocked_import_books.call_args.kwargs['crawl'])
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_run_import_job_error(self, mocked_import_books):
+        """ Test running import job which raises an error. """
+        mocked_import_books.side_effect = ValueError('Broken data')
+        job = create_sample_job()
+        run_import_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertEqual(job.error, 'Broken data')
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_run_import_job_already_claimed(self, mocked_import_books):
+        """ Test running import job claimed by another worker. """
+        job = create_sample_job()
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.RUNNING)
+        run = run_import_job(job.pk)
+        self.assertFalse(run)
+        mocked_import_books.assert_not_called()
+
+    def test_requeue_stale_jobs(self):
+        """ Test running jobs without a recent heartbeat queued again. """
+        old = timezone.now() - timedelta(hours=1)
+        stale, live, legacy, excluded = [create_sample_job() for i in range(4)]
+        ImportJob.objects.filter(pk__in=[stale.pk, excluded.pk]).update(
+            status=ImportJob.RUNNING, started_at=old, heartbeat_at=old)
+        ImportJob.objects.filter(pk=live.pk).update(
+            status=ImportJob.RUNNING, started_at=old,
+            heartbeat_at=timezone.now())
+        ImportJob.objects.filter(pk=legacy.pk).update(
+            status=ImportJob.RUNNING, started_at=old)
+        requeued = requeue_stale_jobs(60, exclude=[excluded.pk])
+        self.assertEqual(requeued, 2)
+        statuses = dict(ImportJob.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {
+            stale.pk: ImportJob.QUEUED, live.pk: ImportJob.RUNNING,
+            legacy.pk: ImportJob.QUEUED, excluded.pk: ImportJob.RUNNING})
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_run_import_job_heartbeat(self, mocked_import_books):
+        """ Test progress of import job refreshes its heartbeat. """
+        job = create_sample_job()
+
+        def import_books(progress, **kwargs):
+            ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=None)
+            progress(5)
+            self.assertIsNotNone(
+                ImportJob.objects.get(pk=job.pk).heartbeat_at)
+            return create_sample_result(created=5)
+
+        mocked_import_books.side_effect = import_books
+        run_import_job(job.pk)
+        self.assertEqual(ImportJob.objects.get(pk=job.pk).total, 5)
+
+
+class ImportJobViewTests(TestCase):
+
+    def test_import_job_status(self):
+        """ Test import job status view. """
+        job = create_sample_job()
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.RUNNING, total=7)
+        response = self.client.get(
+            reverse('books:import-job', kwargs={'pk': job.pk}))
+        self.assertContains(response, 'Running')
+        self.assertContains(response, '<td>7</td>', html=True)
+
+    def test_import_job_report(self):
+        """ Test import job view shows counts and stage timings. """
+        job = create_sample_job()
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.DONE, total=7,
+            report=create_sample_result(created=7, skipped=2).as_dict())
+        response = self.client.get(
+            reverse('books:import-job', kwargs={'pk': job.pk}))
+        self.assertContains(
+            response, '<tr><th>Skipped books</th><td>2</td></tr>', html=True)
+        self.assertContains(
+            response, '<tr><th>Fetch</th><td>0.0 s</td></tr>', html=True)
+
+
+class ProcessImportJobsCommandTests(TransactionTestCase):
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_process_import_jobs_once(self, mocked_import_books):
+        """ Test worker command executes all queued jobs and exits. """
+        mocked_import_books.return_value = create_sample_result(created=3)
+        jobs = [create_sample_job() for i in range(3)]
+        out = StringIO()
+        call_command('process_import_jobs', workers=2, once=True, stdout=out)
+        results = set(ImportJob.objects.values_list('status', 'error'))
+        self.assertEqual(results, {(ImportJob.DONE, '')})
+        self.assertEqual(mocked_import_books.call_count, len(jobs))
+
+    @patch.object(ExternalApi, 'import_books')
+    def test_process_import_jobs_requeues_stale(self, mocked_import_books):
+        """ Test worker command runs again a job abandoned by a worker. """
+        mocked_import_books.return_value = create_sample_result(created=3)
+        job = create_sample_job()
+        old = timezone.now() - timedelta(hours=1)
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.RUNNING, started_at=old, heartbeat_at=old)
+        err = StringIO()
+        call_command('process_import_jobs', once=True, stale_after=60,
+                     stdout=StringIO(), stderr=err)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertIn('Requeued 1 stale job(s)', err.getvalue())
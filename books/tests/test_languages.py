@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from books.models import Language
+from books.languages import language_resolver
+from books.tests.test_models import create_sample_language
+
+
+class LanguageResolverTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        language_resolver.invalidate()
+
+    def test_get_or_create_cached(self):
+        """ Test resolving existing language from cache. """
+        with self.assertNumQueries(1):
+            language_resolver.get_or_create('pl')
+        with self.assertNumQueries(0):
+            language = language_resolver.get_or_create('pl')
+        self.assertEqual(language, self.language)
+
+    def test_get_or_create_new_language(self):
+        """ Test creating missing language. """
+        language = language_resolver.get_or_create('en')
+        self.assertEqual(language.shortcut, 'en')
+        self.assertEqual(Language.objects.count(), 2)
+        self.assertEqual(language_resolver.get_or_create('en'), language)
+
+    def test_invalidated_on_write(self):
+        """ Test cached languages dropped when a language changes. """
+        language_resolver.get_ids('pl')
+        self.language.shortcut = 'PL'
+        self.language.save()
+        self.assertEqual(language_resolver.get_or_create('PL'), self.language)
+
+    def test_get_ids(self):
+        """ Test resolving language ids case-insensitively. """
+        other = create_sample_language(language='Polski', shortcut='PL')
+        self.assertCountEqual(
+            language_resolver.get_ids('Pl'), [self.language.id, other.id])
+        self.assertEqual(language_resolver.get_ids('en'), [])
+
+    def test_get_ids_reloads_missing(self):
+        """ Test languages reloaded when shortcut is not cached,
+        e.g. created by another process. """
+        language_resolver.get_ids('pl')
+        Language.objects.bulk_create([Language(language='English', shortcut='en')])
+        self.assertEqual(len(language_resolver.get_ids('en')), 1)
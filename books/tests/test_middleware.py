@@ -0,0 +1,46 @@
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from books.middleware import SqlInstrumentationMiddleware
+from books.models import Language
+
+
+class SqlInstrumentationMiddlewareTests(TestCase):
+
+    @override_settings(SQL_INSTRUMENTATION={
+        'ENABLED': True, 'SLOW_REQUEST_MS': None})
+    def test_server_timing(self):
+        """ Test query count and database time in Server-Timing header. """
+        response = self.client.get(reverse('books:language-list'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="1 queries", '
+                                 r'app;dur=[\d.]+$')
+
+    @override_settings(SQL_INSTRUMENTATION={
+        'ENABLED': True, 'SLOW_REQUEST_MS': 0, 'TOP_QUERIES': 1})
+    def test_slow_request_logged(self):
+        """ Test slow request logged with repeated SQL grouped. """
+        def view(request):
+            for i in range(3):
+                list(Language.objects.filter(id=i))
+            list(Language.objects.all())
+            return HttpResponse()
+
+        middleware = SqlInstrumentationMiddleware(view)
+        request = RequestFactory().get('/')
+        with self.assertLogs('books.middleware', 'WARNING') as logs:
+            middleware(request)
+        message = logs.output[0]
+        self.assertIn('4 queries', message)
+        self.assertIn('3x', message)
+        self.assertEqual(message.count(' ms: '), 1)
+
+    @override_settings(SQL_INSTRUMENTATION={'ENABLED': False})
+    def test_disabled(self):
+        """ Test middleware not loaded when disabled. """
+        with self.assertRaises(MiddlewareNotUsed):
+            SqlInstrumentationMiddleware(HttpResponse)
+        response = self.client.get(reverse('books:language-list'))
+        self.assertFalse(response.has_header('Server-Timing'))
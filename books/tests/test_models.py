@@ -68,6 +68,29 @@ class AuthorTests(TestCase):
         self.assertEqual(author.second_name, 'Ch.')
         self.assertEqual(author.last_name, 'Andersen')
 
+    def test_get_or_create_many_existing_authors(self):
+        """ Test get or create many Manager's method matches existing
+        authors by last name and first letter of the first name
+        with a single query. """
+        author = create_sample_author()
+        create_sample_author(first_name='Kasper', last_name='Andersen')
+        with self.assertNumQueries(1):
+            authors = Author.objects.get_or_create_many(
+                ['H. Ch. Andersen', 'Hans Andersen'])
+        self.assertEqual(authors, [author, author])
+        self.assertEqual(Author.objects.count(), 2)
+
+    def test_get_or_create_many_duplicated_names(self):
+        """ Test get or create many Manager's method creates an author
+        only once when matching names are passed together. """
+        with self.assertNumQueries(3):
+            authors = Author.objects.get_or_create_many(
+                ['Henryk Sienkiewicz', 'H. Sienkiewicz', 'Adam Mickiewicz'])
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(authors[0], authors[1])
+        self.assertEqual(authors[0].first_name, 'Henryk')
+        self.assertEqual(authors[2].last_name, 'Mickiewicz')
+
     def test_unique_constrains(self):
         """ Test class unique_constrains. """
         create_sample_author()
@@ -0,0 +1,108 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.urls import reverse
+from django.test import TestCase
+
+from books.models import Book
+from books.cache import get_listing_cache_key
+from books.filters import BookFilter
+from books.views import BookFilterListView
+from books.pagination import LimitedCountPaginator, get_cached_count
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+class LimitedCountTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+        for i in range(7):
+            self.create_book(i)
+
+    def create_book(self, number: int) -> Book:
+        return create_sample_book(
+            title=f'Book {number}', language=self.language,
+            authors=[self.author])
+
+    def get_key(self) -> str:
+        return get_listing_cache_key('count:test', {}, BookFilter)
+
+    def test_get_cached_count(self):
+        """ Test counts cached until the catalogue changes. """
+        queryset = Book.objects.order_by('title')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_cached_count(queryset, self.get_key()), (7, True))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_count(queryset, self.get_key()), (7, True))
+        self.create_book(7)
+        self.assertEqual(get_cached_count(queryset, self.get_key()), (8, True))
+
+    def test_get_cached_count_limit(self):
+        """ Test counting stops above passed limit. """
+        count = get_cached_count(Book.objects.all(), self.get_key(), limit=3)
+        self.assertEqual(count, (3, False))
+
+    def test_paginator_exact(self):
+        """ Test paginator with an exact count. """
+        paginator = LimitedCountPaginator(
+            Book.objects.order_by('title'), 2, count_key=self.get_key())
+        self.assertTrue(paginator.is_exact)
+        self.assertEqual(paginator.num_pages, 4)
+        self.assertFalse(paginator.page(4).has_next())
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
+
+    def test_paginator_limited(self):
+        """ Test paginating beyond a limited count. """
+        paginator = LimitedCountPaginator(
+            Book.objects.order_by('title'), 2, count_key=self.get_key(),
+            limit=3)
+        self.assertFalse(paginator.is_exact)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(paginator.page(2).end_index(), 4)
+        page = paginator.page(3)
+        self.assertTrue(page.has_next())
+        self.assertEqual([book.title for book in page], ['Book 4', 'Book 5'])
+        page = paginator.page(4)
+        self.assertFalse(page.has_next())
+        self.assertEqual([book.title for book in page], ['Book 6'])
+        self.assertEqual(page.end_index(), 7)
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
+
+    @patch('books.pagination.COUNT_LIMIT', 3)
+    def test_book_list_limited_count(self):
+        """ Test HTML book list pages beyond a limited count. """
+        with patch.object(BookFilterListView, 'paginate_by', 2):
+            response = self.client.get(reverse('books:book-list') + '?page=3')
+            self.assertContains(response, 'Page 3 of more than 2')
+            self.assertContains(response, 'page=4">Next</a>')
+            self.assertNotContains(response, '>Last</a>')
+            response = self.client.get(reverse('books:book-list') + '?page=5')
+            self.assertEqual(response.status_code, 404)
+
+    def test_book_list_last_page(self):
+        """ Test HTML book list last page is found only
+        when the count is exact. """
+        url = reverse('books:book-list')
+        with patch.object(BookFilterListView, 'paginate_by', 2):
+            response = self.client.get(url, {'page': 'last'})
+            self.assertContains(response, 'Page 4 of 4')
+            with patch('books.pagination.COUNT_LIMIT', 3):
+                cache.clear()
+                response = self.client.get(url, {'page': 'last'})
+                self.assertEqual(response.status_code, 404)
+
+    @patch('books.pagination.COUNT_LIMIT', 3)
+    def test_api_count(self):
+        """ Test API count requested with the count parameter. """
+        url = reverse('book-list')
+        data = self.client.get(url).json()
+        self.assertNotIn('count', data)
+        data = self.client.get(url, {'count': '1'}).json()
+        self.assertEqual((data['count'], data['count_exact']), (3, False))
+        data = self.client.get(
+            url, {'count': 'true', 'title__contains': 'Book 1'}).json()
+        self.assertEqual((data['count'], data['count_exact']), (1, True))
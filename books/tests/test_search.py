@@ -0,0 +1,126 @@
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+
+from books.models import Book
+from books.db import SEARCH_TABLE, rebuild_search_index
+from books.search import get_match_query, search_books
+from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
+
+
+def get_search_row(book: Book) -> tuple:
+    """ Returns full-text search table row of passed book. """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT title, authors FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [book.pk])
+        return cursor.fetchone()
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.language = create_sample_language()
+        self.author = create_sample_author()
+        self.book = create_sample_book(
+            language=self.language, authors=[self.author])
+
+    def test_book_insert(self):
+        """ Test search table row created with book and its authors. """
+        self.assertEqual(
+            get_search_row(self.book),
+            ('Brzydkie kaczątko', 'Hans Christian Andersen'))
+
+    def test_book_update(self):
+        """ Test search table row updated with book title. """
+        self.book.title = 'Królowa śniegu'
+        self.book.save()
+        self.assertEqual(get_search_row(self.book)[0], 'Królowa śniegu')
+
+    def test_book_authors_change(self):
+        """ Test search table row updated with book authors. """
+        author = create_sample_author(
+            first_name='Henryk', second_name='', last_name='Sienkiewicz')
+        self.book.authors.add(author)
+        self.assertEqual(
+            get_search_row(self.book)[1],
+            'Hans Christian Andersen Henryk  Sienkiewicz')
+        self.book.authors.remove(self.author)
+        self.assertEqual(get_search_row(self.book)[1], 'Henryk  Sienkiewicz')
+
+    def test_author_update(self):
+        """ Test search table rows updated with author names. """
+        self.author.second_name = 'Ch.'
+        self.author.save()
+        self.assertEqual(get_search_row(self.book)[1], 'Hans Ch. Andersen')
+
+    def test_book_delete(self):
+        """ Test search table row deleted with book. """
+        book_id = self.book.pk
+        self.book.delete()
+        self.book.pk = book_id
+        self.assertIsNone(get_search_row(self.book))
+
+    def test_rebuild_search_index(self):
+        """ Test filling search table from existing books. """
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        rebuild_search_index()
+        self.assertEqual(
+            get_search_row(self.book),
+            ('Brzydkie kaczątko', 'Hans Christian Andersen'))
+
+
+class SearchBooksTests(TestCase):
+
+    def setUp(self):
+        language = create_sample_language()
+        andersen = create_sample_author()
+        sienkiewicz = create_sample_author(
+            first_name='Henryk', second_name='', last_name='Sienkiewicz')
+        self.ugly_duckling = create_sample_book(
+            language=language, authors=[andersen])
+        self.snow_queen = create_sample_book(
+            title='Królowa śniegu', language=language, authors=[andersen])
+        self.deluge = create_sample_book(
+            title='Potop: Andersen', language=language, authors=[sienkiewicz])
+
+    def test_get_match_query(self):
+        """ Test converting user input into FTS5 prefix query. """
+        self.assertEqual(get_match_query('Hans "Ander'), '"Hans"* "Ander"*')
+        self.assertEqual(get_match_query(' "*'), '')
+
+    def test_search_books(self):
+        """ Test searching books by prefixes of title and author words. """
+        books = search_books(Book.objects.all(), 'krolowa ANDERS')
+        self.assertEqual(list(books), [self.snow_queen])
+
+    def test_search_books_ranking(self):
+        """ Test title matches ranked higher than author matches. """
+        books = search_books(Book.objects.all(), 'andersen')
+        self.assertEqual(books[0], self.deluge)
+        self.assertEqual(len(books), 3)
+
+    def test_search_book_list_view(self):
+        """ Test search parameter of book list view. """
+        response = self.client.get(reverse('books:book-list'), {'q': 'potop'})
+        self.assertContains(response, 'Potop: Andersen')
+        self.assertNotContains(response, 'Królowa śniegu')
+
+    def test_search_api(self):
+        """ Test search parameter of books API ordered by relevance. """
+        response = self.client.get(reverse('book-list'), {'q': 'andersen'})
+        titles = [book['title'] for book in response.json()['results']]
+        self.assertEqual(titles[0], 'Potop: Andersen')
+        self.assertEqual(len(titles), 3)
+
+    def test_search_api_pagination(self):
+        """ Test paging through search results of books API. """
+        url = reverse('book-list') + '?q=andersen&page_size=1'
+        titles = []
+        while url:
+            data = self.client.get(url).json()
+            titles += [book['title'] for book in data['results']]
+            url = data['next']
+        self.assertEqual(len(titles), 3)
+        self.assertEqual(titles[0], 'Potop: Andersen')
@@ -2,7 +2,7 @@ from unittest.mock import patch
 from django.urls import reverse
 from django.test import TestCase
 
-from books.models import Author, Book, Language
+from books.models import Author, Book, Language, ImportJob
 from books.external_api import ExternalApi
 from books.tests.test_models import create_sample_author, create_sample_language, create_sample_book
 
@@ -104,6 +104,24 @@ class BookViewTests(TestCase):
             language=self.language, authors=[
                 self.author])
 
+    def test_book_list_paginated(self):
+        """ Test book list view paginates filtered books
+        with a constant number of queries. """
+        for i in range(60):
+            create_sample_book(
+                title=f'Book {i:02}',
+                language=self.language,
+                authors=[self.author])
+        url = reverse('books:book-list')
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                url, {'title__icontains': 'book', 'page': 2})
+        self.assertEqual(len(response.context['object_list']), 10)
+        self.assertContains(response, 'Book 59')
+        self.assertContains(response, 'Page 2 of 2')
+        self.assertContains(
+            response, '?title__icontains=book&amp;page=1')
+
     def test_delete_book(self):
         """ Test delete book view. """
         book = Book.objects.first()
@@ -120,11 +138,14 @@ class ApiImportViewTests(TestCase):
         data = {
             'url': 'https://www.googleapis.com/books/v1/volumes?q=Hobbit',
         }
-        mocked_import_books.return_value = 0
         response = self.client.post(reverse('books:api-import'), data)
+        job = ImportJob.objects.get()
         self.assertRedirects(
             response,
-            reverse('books:book-list'),
+            reverse('books:import-job', kwargs={'pk': job.pk}),
             status_code=302,
             target_status_code=200,
             fetch_redirect_response=True)
+        self.assertEqual(job.url, data['url'])
+        self.assertEqual(job.status, ImportJob.QUEUED)
+        mocked_import_books.assert_not_called()
@@ -13,6 +13,7 @@ from books.views import (
     LanguageCreateView,
     LanguageUpdateView,
     LanguageDeleteView,
+    ImportJobDetailView,
     api_import
 )
 
@@ -69,5 +70,9 @@ urlpatterns = [
     path(
         'import/',
         api_import,
-        name='api-import')
+        name='api-import'),
+    path(
+        'import/<int:pk>/',
+        ImportJobDetailView.as_view(),
+        name='import-job')
 ]
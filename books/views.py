@@ -1,17 +1,79 @@
+from django.core.cache import cache
+from django.http import HttpResponse, Http404
 from django.shortcuts import render, redirect
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.urls import reverse_lazy
 from django_filters.views import FilterView
-from django.views.generic import CreateView, UpdateView, DeleteView, ListView
+from django.views.generic import CreateView, UpdateView, DeleteView, ListView, DetailView
 
-from books.models import Author, Book, Language
+from books.models import Author, Book, Language, ImportJob
 from books.filters import BookFilter
 from books.forms import ApiImportForm
-from books.external_api import ExternalApi
+from books.pagination import LimitedCountPaginator
+from books.cache import (
+    LISTING_CACHE_TIMEOUT,
+    ROW_CACHE_TIMEOUT,
+    get_book_row_versions,
+    get_listing_cache_key,
+    get_catalogue_etag
+)
 
 
+@method_decorator(condition(etag_func=get_catalogue_etag), name='get')
 class BookFilterListView(FilterView):
-    """ Book filter list view class. """
+    """ Book filter list view class. Rendered pages are cached
+    until the catalogue changes. """
     filterset_class = BookFilter
+    queryset = Book.objects.select_related('language').prefetch_related(
+        'authors').order_by('title', 'id')
+    paginate_by = 50
+
+    def get(self, request, *args, **kwargs):
+        key = get_listing_cache_key(
+            'html', request.GET, self.filterset_class, extra=['page'])
+        content = cache.get(key)
+        if content is None:
+            response = super().get(request, *args, **kwargs).render()
+            cache.set(key, response.content, LISTING_CACHE_TIMEOUT)
+            return response
+        return HttpResponse(content)
+
+    def paginate_queryset(self, queryset, page_size):
+        """ Paginates queryset, the last page is not found
+        when the count is limited, as it isn't known. """
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(
+            self.page_kwarg)
+        if page == 'last':
+            paginator = self.get_paginator(
+                queryset, page_size, orphans=self.get_paginate_orphans(),
+                allow_empty_first_page=self.get_allow_empty())
+            if not paginator.is_exact:
+                raise Http404('The last page of a limited count is not known.')
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """ Returns paginator with counts cached per filters
+        and limited for big results. """
+        return LimitedCountPaginator(
+            queryset, per_page, count_key=get_listing_cache_key(
+                'count:html', self.request.GET, self.filterset_class),
+            **kwargs)
+
+    def get_context_data(self, **kwargs):
+        """ Adds query string of applied filters for page links
+        and versions of rows used as fragment cache keys. """
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        context['querystring'] = params.urlencode()
+        books = list(context['object_list'])
+        versions = get_book_row_versions(books)
+        for book in books:
+            book.row_version = versions[book.pk]
+        context['object_list'] = books
+        context['row_cache_timeout'] = ROW_CACHE_TIMEOUT
+        return context
 
 
 class BookCreateView(CreateView):
@@ -87,15 +149,20 @@ class LanguageDeleteView(DeleteView):
     success_url = reverse_lazy('books:language-list')
 
 
+class ImportJobDetailView(DetailView):
+    """ Import job status view class. """
+    model = ImportJob
+
+
 def api_import(request):
-    """ View for import data from external API. """
+    """ View for queueing import of data from external API. """
     if request.method == 'POST':
         form = ApiImportForm(request.POST)
         if form.is_valid():
-            url = form.cleaned_data['url']
-            external_api = ExternalApi(url)
-            total = external_api.import_books()
-            return redirect('books:book-list')
+            job = ImportJob.objects.create(
+                url=form.cleaned_data['url'],
+                crawl=form.cleaned_data['crawl'])
+            return redirect('books:import-job', pk=job.pk)
     else:
         form = ApiImportForm()
     return render(request, 'books/api_import.html', {'form': form})
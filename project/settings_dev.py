@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'books.middleware.SqlInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -85,6 +86,34 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+# Per-request query counts and database time (Server-Timing header),
+# requests slower than SLOW_REQUEST_MS are logged with their top SQL.
+SQL_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 200,
+    'TOP_QUERIES': 5,
+}
+
+# Responses of external API cached on disk by the books importer.
+EXTERNAL_API_CACHE = {
+    'DIRECTORY': os.path.join(BASE_DIR, 'external_api_cache'),
+    'TTL': 24 * 60 * 60,
+    'MAX_SIZE': 100 * 1024 * 1024,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
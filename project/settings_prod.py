@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'books.middleware.SqlInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,6 +87,37 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# File based cache is shared by all worker processes, so the catalogue
+# version bumped by one process invalidates listings cached by others.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    }
+}
+
+# Per-request query counts and database time (Server-Timing header),
+# requests slower than SLOW_REQUEST_MS are logged with their top SQL.
+SQL_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 500,
+    'TOP_QUERIES': 5,
+}
+
+# Responses of external API cached on disk by the books importer.
+EXTERNAL_API_CACHE = {
+    'DIRECTORY': os.path.join(BASE_DIR, 'external_api_cache'),
+    'TTL': 24 * 60 * 60,
+    'MAX_SIZE': 1024 * 1024 * 1024,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 